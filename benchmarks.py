@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from blinkit_backend import Backend, duckdb
+from blinkit_documents import add_document_text
+from blinkit_rollup import build_rollup, query_rollup, query_rows
+from blinkit_store import ANALYSIS_QUERY, apply_schema
+from dashboard_filters import FilterIndex, aggregate_sql, frame_aggregate
+from delay_model import FEATURE_COLUMNS, TARGET, build_pipeline
+from synthetic_data import generate
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+except ImportError:
+    HuggingFaceEmbeddings = None
+
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+
+
+# -------------------------------------------------
+# TIMING
+# -------------------------------------------------
+def timed(fn, repeat=1):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def summary(times, rows=None):
+    # Median seconds always; latency percentiles when the step was repeated
+    report = {"seconds": round(float(np.median(times)), 4)}
+    if len(times) > 1:
+        report["p50_ms"] = round(float(np.percentile(times, 50)) * 1000, 2)
+        report["p95_ms"] = round(float(np.percentile(times, 95)) * 1000, 2)
+    if rows is not None:
+        report["rows"] = int(rows)
+        report["rows_per_second"] = round(rows / max(report["seconds"], 1e-9))
+    return report
+
+
+# -------------------------------------------------
+# STAGES
+# -------------------------------------------------
+def bench_dashboard(backend, repeat):
+    results = {}
+    frame, times = timed(lambda: apply_schema(backend.read_sql("SELECT * FROM blinkit_data"))
+                         .sort_values("order_day_only", kind="stable").reset_index(drop=True))
+    results["dashboard_load"] = summary(times, len(frame))
+
+    start_date, end_date = frame["order_day_only"].min(), frame["order_day_only"].max()
+    mid_date = start_date + (end_date - start_date) / 2
+
+    cube, times = timed(lambda: build_rollup(frame))
+    results["rollup_build"] = summary(times, len(frame))
+    results["rollup_build"]["cells"] = len(cube)
+
+    _, times = timed(lambda: query_rollup(
+        cube, start_date, end_date, [],
+        {"total_revenue": "revenue_generated", "total_spend": "spend",
+         "avg_roas": "avg_roas", "avg_delay": "avg_delay"}
+    ), repeat)
+    results["rollup_kpis"] = summary(times)
+
+    _, times = timed(lambda: query_rollup(
+        cube, mid_date, end_date, ["order_day_only"], {"revenue": "order_total", "spend": "spend"}
+    ), repeat)
+    results["rollup_daily"] = summary(times)
+
+    index, times = timed(lambda: FilterIndex(frame))
+    results["filter_index_build"] = summary(times, len(frame))
+
+    filters = {dim: index.options(dim)[:2] for dim in ["area", "channel", "sentiment"]}
+    rows, times = timed(lambda: index.select(start_date, end_date, filters), repeat)
+    results["cross_filter_select"] = summary(times, len(rows))
+
+    _, times = timed(lambda: frame_aggregate(
+        frame, rows, ["category"], {"revenue": ("sum", "item_total"), "orders": ("distinct", "order_id")}
+    ), repeat)
+    results["cross_filter_group_by"] = summary(times, len(rows))
+
+    query = aggregate_sql(["product_name"], {"sales": ("sum", "item_total"),
+                                             "avg_margin": ("avg", "margin_percentage")},
+                          start_date.date(), end_date.date())
+    _, times = timed(lambda: backend.read_sql(query), repeat)
+    results["sql_group_by"] = summary(times)
+    return results, frame
+
+
+def bench_documents(joined, doc_rows):
+    sample = joined.head(doc_rows).copy()
+    docs, times = timed(lambda: add_document_text(sample))
+    return summary(times, len(docs)), docs["full_text"].tolist()
+
+
+def bench_embedding(texts, embed_rows):
+    if embed_rows <= 0:
+        return {"skipped": "--embed-rows 0"}, None
+    if HuggingFaceEmbeddings is None:
+        return {"skipped": "langchain_community not installed"}, None
+    try:
+        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+    except Exception as e:  # sentence-transformers missing, or the model not downloadable offline
+        return {"skipped": f"{EMBEDDING_MODEL} unavailable: {e}"}, None
+    batch = texts[:embed_rows]
+    vectors, times = timed(lambda: embeddings.embed_documents(batch))
+    report = summary(times, len(batch))
+    report["model"] = EMBEDDING_MODEL
+    return report, np.asarray(vectors, dtype="float32")
+
+
+def bench_faiss(vectors, n_vectors, queries, repeat_k=5):
+    if faiss is None:
+        return {"skipped": "faiss not installed"}
+    source = "embeddings"
+    if vectors is None:
+        # No embedder here: random unit vectors of the same width still
+        # measure index build and search cost
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(n_vectors, EMBEDDING_DIM)).astype("float32")
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        source = "random"
+
+    # IndexFlatL2, the index FAISS.from_documents builds for the chatbot
+    index, times = timed(lambda: faiss.IndexFlatL2(vectors.shape[1]))
+    _, add_times = timed(lambda: index.add(vectors))
+    report = {"vectors": len(vectors), "source": source,
+              "build_seconds": round(times[0] + add_times[0], 4)}
+    picks = vectors[np.arange(queries) % len(vectors)]
+    latencies = []
+    for query in picks:
+        _, t = timed(lambda: index.search(query[None, :], repeat_k))
+        latencies += t
+    report.update({f"search_{key}": value for key, value in summary(latencies).items()})
+    return report
+
+
+def bench_delay_prediction(frame, train_rows, trees, predict_calls):
+    data = frame.dropna(subset=[TARGET]).head(train_rows)
+    X, y = data[FEATURE_COLUMNS], data[TARGET]
+    pipeline = build_pipeline(n_jobs=1).set_params(model__n_estimators=trees)
+
+    _, fit_times = timed(lambda: pipeline.fit(X, y))
+    _, batch_times = timed(lambda: pipeline.predict(X))
+    single = X.head(1)
+    _, single_times = timed(lambda: pipeline.predict(single), predict_calls)
+
+    report = {"train_rows": len(X), "trees": trees,
+              "fit_seconds": round(fit_times[0], 4)}
+    report["batch"] = summary(batch_times, len(X))
+    report["single_row"] = summary(single_times)
+    return report
+
+
+# -------------------------------------------------
+# CORRECTNESS CHECKS
+# -------------------------------------------------
+def distinct_orders_sql(dim, where=""):
+    return f"SELECT {dim}, COUNT(DISTINCT order_id) AS orders FROM blinkit_data {where} GROUP BY {dim}"
+
+
+def same_counts(expected, actual, dim):
+    # Both as {label: count}; labels as text since SQL and categoricals differ in type
+    want = dict(zip(expected[dim].astype(str), expected["orders"].astype(float)))
+    got = dict(zip(actual[dim].astype(str), actual["orders"].astype(float)))
+    return want == got
+
+
+def check_order_counts(backend, frame):
+    # The dashboard's order counts against SQL COUNT(DISTINCT order_id): from
+    # the cube without filters, from the indexed rows under a category filter
+    # (category splits orders, so it is not a cube dimension)
+    start_date, end_date = frame["order_day_only"].min(), frame["order_day_only"].max()
+    cube, index = build_rollup(frame), FilterIndex(frame)
+    category = str(frame["category"].value_counts().index[0])
+    report = {"category": category}
+    for dim in ["order_day_name", "area"]:
+        cube_counts = query_rollup(cube, start_date, end_date, [dim], {"orders": "orders"})
+        report[f"cube_{dim}"] = same_counts(backend.read_sql(distinct_orders_sql(dim)), cube_counts, dim)
+
+        rows = index.select(start_date, end_date, {"category": [category]})
+        row_counts = query_rows(frame, rows, [dim], {"orders": "orders"})
+        expected = backend.read_sql(distinct_orders_sql(dim, f"WHERE category = '{category}'"))
+        report[f"category_filter_{dim}"] = same_counts(expected, row_counts, dim)
+    return report
+
+
+# -------------------------------------------------
+# RUN
+# -------------------------------------------------
+def run(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix="blinkit-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, f"blinkit.{'duckdb' if args.backend == 'duckdb' else 'db'}")
+    results = {}
+
+    stats = generate(db_path, orders=args.orders, chunk_orders=args.chunk_orders, seed=args.seed)
+    total_rows = sum(stats["rows"].values())
+    results["generate"] = {"seconds": stats["generate_seconds"], "rows": total_rows,
+                           "rows_per_second": round(total_rows / max(stats["generate_seconds"], 1e-9))}
+    results["ingest"] = {"seconds": stats["write_seconds"], "rows": total_rows,
+                         "rows_per_second": round(total_rows / max(stats["write_seconds"], 1e-9))}
+
+    # SQLite / DuckDB stand-in for MySQL, through the same backend layer the apps use
+    backend = Backend({"backend": args.backend, "path": db_path})
+    joined, times = timed(lambda: backend.read_sql(ANALYSIS_QUERY))
+    results["six_way_join"] = summary(times, len(joined))
+
+    dashboard, frame = bench_dashboard(backend, args.repeat)
+    results.update(dashboard)
+    results["order_counts"] = check_order_counts(backend, frame)
+    backend.close()
+
+    results["document_building"], texts = bench_documents(joined, args.doc_rows)
+    results["embedding"], vectors = bench_embedding(texts, args.embed_rows)
+    results["faiss_search"] = bench_faiss(vectors, len(texts), args.queries)
+    results["delay_prediction"] = bench_delay_prediction(frame, args.train_rows, args.trees, args.predict_calls)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "orders": args.orders,
+            "backend": args.backend,
+            "cardinalities": stats["cardinalities"],
+            "table_rows": stats["rows"],
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+        },
+        "results": results,
+    }
+
+
+# -------------------------------------------------
+# REGRESSION COMPARISON
+# -------------------------------------------------
+def timing_metrics(results, prefix=""):
+    # Flattens every *seconds / *_ms value, e.g. delay_prediction.batch.seconds
+    metrics = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            metrics.update(timing_metrics(value, name + "."))
+        elif isinstance(value, (int, float)) and (key.endswith("seconds") or key.endswith("_ms")):
+            metrics[name] = value
+    return metrics
+
+
+def compare(current, baseline, tolerance):
+    now, before = timing_metrics(current["results"]), timing_metrics(baseline["results"])
+    regressions = []
+    print(f"{'metric':<45}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name in sorted(set(now) & set(before)):
+        if before[name] <= 0:
+            continue
+        change = now[name] / before[name] - 1
+        flag = " <-- slower" if change > tolerance else ""
+        print(f"{name:<45}{before[name]:>12}{now[name]:>12}{change:>+10.0%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Blinkit apps on synthetic data, offline")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--backend", choices=["sqlite", "duckdb"], default="sqlite")
+    parser.add_argument("--workdir", default=None, help="Where the generated database goes (default: temp dir)")
+    parser.add_argument("--chunk-orders", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per dashboard query")
+    parser.add_argument("--doc-rows", type=int, default=20_000)
+    parser.add_argument("--embed-rows", type=int, default=1_000, help="0 skips the embedding stage")
+    parser.add_argument("--queries", type=int, default=200, help="FAISS searches to time")
+    parser.add_argument("--train-rows", type=int, default=20_000)
+    parser.add_argument("--trees", type=int, default=20)
+    parser.add_argument("--predict-calls", type=int, default=100)
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    if args.backend == "duckdb" and duckdb is None:
+        parser.error("--backend duckdb needs `pip install duckdb`")
+
+    report = run(args)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    checks = report["results"]["order_counts"]
+    wrong = [name for name, ok in checks.items() if ok is False]
+    if wrong:
+        print(f"Order counts differ from COUNT(DISTINCT order_id): {', '.join(wrong)}")
+        raise SystemExit(1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} metric(s) slower than baseline by more than {args.tolerance:.0%}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import re
+
+import pandas as pd
+
+
+# -------------------------------------------------
+# TEXT CLEANING
+# -------------------------------------------------
+def clean_text(text):
+    if pd.isna(text):
+        return ""
+    text = text.lower()
+    text = re.sub(r"http\S+", "", text)
+    text = re.sub(r"[^a-z\s]", "", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+# -------------------------------------------------
+# DOCUMENT TEXT
+# -------------------------------------------------
+def add_document_text(df):
+    # clean_feedback first, so it is part of every row's full_text as well
+    df["clean_feedback"] = df["feedback_text"].apply(clean_text)
+
+    # Column-wise: same text as str() on each cell, but float32 columns from
+    # the shared schema print as 17.55, not their float64 widening 17.5499...
+    full_text = df[df.columns[0]].astype(str)
+    for col in df.columns[1:]:
+        full_text = full_text + " | " + df[col].astype(str)
+    df["full_text"] = full_text
+    return df
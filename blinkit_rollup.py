@@ -0,0 +1,194 @@
+import argparse
+import os
+
+import pandas as pd
+
+from blinkit_store import apply_schema, default_dataset, read_table
+from dashboard_filters import frame_aggregate
+
+# -------------------------------------------------
+# CUBE LAYOUT
+# -------------------------------------------------
+ROLLUP_PATH = "blinkit_rollup.parquet"
+
+# Order-level dimensions only: every row of an order falls in the same cell,
+# so "orders" (1 on each order's first row) is an exact distinct count in any
+# slice. Channel and category vary between the items of one order and would
+# multiply the cells towards one per row; queries on them use the row-level
+# data instead (query_rows).
+CATEGORY_DIMENSIONS = ["area", "customer_segment", "sentiment"]
+ITEM_DIMENSIONS = ["channel", "category"]
+DIMENSIONS = ["order_day_only", "order_hour"] + CATEGORY_DIMENSIONS
+
+# Additive measures only, so any slice of the cube can be re-summed
+SUM_MEASURES = ["order_total", "revenue_generated", "spend", "item_total", "quantity"]
+MEASURES = ["rows", "orders"] + SUM_MEASURES + ["delay_sum", "delay_count", "roas_sum", "roas_count"]
+
+SOURCE_COLUMNS = DIMENSIONS + ["order_id", "delay_minutes", "roas"] + SUM_MEASURES
+
+# Computed from order_day_only after slicing, not stored
+DERIVED_DIMENSIONS = {
+    "order_day_name": lambda days: days.dt.day_name(),
+    "order_month_name": lambda days: days.dt.month_name(),
+}
+RATIOS = {
+    "avg_delay": ("delay_sum", "delay_count"),
+    "avg_roas": ("roas_sum", "roas_count"),
+}
+
+# Cube measure -> the frame_aggregate spec answering it from row-level data
+ROW_AGGREGATES = {
+    "rows": ("count", "order_id"),
+    "orders": ("distinct", "order_id"),
+    "avg_delay": ("avg", "delay_minutes"),
+    "avg_roas": ("avg", "roas"),
+    **{col: ("sum", col) for col in SUM_MEASURES},
+}
+
+
+# -------------------------------------------------
+# BUILD / INGEST
+# -------------------------------------------------
+def aggregate(frame, by):
+    return (frame.groupby(by, observed=True, dropna=False, sort=False)[MEASURES]
+                 .sum()
+                 .reset_index())
+
+
+def finish(cube):
+    # Day-sorted so a date range is a contiguous slice found by binary search
+    for dim in CATEGORY_DIMENSIONS:
+        cube[dim] = cube[dim].astype("category")
+    return cube.sort_values(DIMENSIONS, kind="stable").reset_index(drop=True)
+
+
+def build_rollup(frame):
+    frame = frame[SOURCE_COLUMNS]
+    rows = pd.DataFrame({dim: frame[dim] for dim in DIMENSIONS})
+    rows["order_day_only"] = pd.to_datetime(rows["order_day_only"]).dt.normalize()
+    rows["rows"] = 1
+    rows["orders"] = (~frame["order_id"].duplicated()).astype("int64")
+    for col in SUM_MEASURES:
+        rows[col] = frame[col].astype("float64")
+    rows["delay_sum"] = frame["delay_minutes"].astype("float64")
+    rows["delay_count"] = frame["delay_minutes"].notna().astype("int64")
+    rows["roas_sum"] = frame["roas"].astype("float64")
+    rows["roas_count"] = frame["roas"].notna().astype("int64")
+    return finish(aggregate(rows, DIMENSIONS))
+
+
+def merge_rollups(cube, new_cube):
+    # Incremental ingest: only new rows are scanned, then cells are re-summed
+    combined = pd.concat(
+        [cube.astype({dim: "object" for dim in CATEGORY_DIMENSIONS}),
+         new_cube.astype({dim: "object" for dim in CATEGORY_DIMENSIONS})],
+        ignore_index=True
+    )
+    return finish(aggregate(combined, DIMENSIONS))
+
+
+def save_rollup(cube, path=ROLLUP_PATH):
+    tmp_path = path + ".tmp"
+    cube.to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, path)
+
+
+def load_rollup(path=ROLLUP_PATH):
+    return pd.read_parquet(path, engine="pyarrow")
+
+
+def rollup_version(path=ROLLUP_PATH):
+    # Apps key their cache on this, so an ingest is picked up; None when missing
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+# -------------------------------------------------
+# QUERY
+# -------------------------------------------------
+def slice_days(cube, start_date, end_date):
+    days = cube["order_day_only"]
+    lo = days.searchsorted(pd.Timestamp(start_date), side="left")
+    hi = days.searchsorted(pd.Timestamp(end_date), side="right")
+    return cube.iloc[lo:hi]
+
+
+def matching_mask(column, values):
+    # Case-insensitive like MySQL's default collation ('negative' = 'Negative')
+    wanted = {str(v).lower() for v in values}
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        keep = [c for c in column.cat.categories if str(c).lower() in wanted]
+        return column.isin(keep)
+    return column.astype(str).str.lower().isin(wanted)
+
+
+def query_rollup(cube, start_date, end_date, by, measures, where=None):
+    # measures maps output column -> cube measure or ratio name; where is a
+    # {dim: values} dict, or a list of them that must all hold
+    part = slice_days(cube, start_date, end_date)
+    for conditions in (where if isinstance(where, list) else [where or {}]):
+        for dim, values in conditions.items():
+            part = part[matching_mask(part[dim], values)]
+
+    part = part.assign(**{
+        name: derive(part["order_day_only"])
+        for name, derive in DERIVED_DIMENSIONS.items() if name in by
+    })
+    if by:
+        result = aggregate(part, by).sort_values(by, kind="stable").reset_index(drop=True)
+    else:
+        result = part[MEASURES].sum().to_frame().T
+
+    for name, (total, count) in RATIOS.items():
+        ratio = result[total] / result[count].where(result[count] > 0)
+        result[name] = ratio.to_numpy(dtype="float64", na_value=float("nan"))
+    # Rounded only for cubes built before orders were stored as whole counts
+    result["orders"] = result["orders"].round().astype("int64")
+    return result[list(by) + list(measures.values())].rename(
+        columns={source: name for name, source in measures.items()}
+    )
+
+
+def outside_cube(by, where=None):
+    # True when the query groups or filters on a dimension the cube doesn't hold
+    dims = set(by)
+    for conditions in (where if isinstance(where, list) else [where or {}]):
+        dims.update(dim for dim, values in conditions.items() if values)
+    return not dims <= set(DIMENSIONS) | set(DERIVED_DIMENSIONS)
+
+
+def query_rows(frame, rows, by, measures, where=None):
+    # query_rollup's result from row positions of the row-level frame, with
+    # COUNT(DISTINCT order_id) for "orders"; for queries outside the cube
+    for conditions in (where if isinstance(where, list) else [where or {}]):
+        for dim, values in conditions.items():
+            rows = rows[matching_mask(frame[dim].take(rows), values).to_numpy()]
+    aggs = {name: ROW_AGGREGATES[source] for name, source in measures.items()}
+    result = frame_aggregate(frame, rows, by, aggs)
+    if by:
+        result = result.sort_values(list(by), kind="stable").reset_index(drop=True)
+    return result
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Build or update the Blinkit daily rollup cube")
+    parser.add_argument("command", choices=["build", "ingest"])
+    parser.add_argument("data", nargs="?", default=default_dataset(),
+                        help="Full dataset for build, newly ingested rows for ingest")
+    parser.add_argument("--rollup", default=ROLLUP_PATH)
+    args = parser.parse_args()
+
+    new_cube = build_rollup(apply_schema(read_table(args.data, columns=SOURCE_COLUMNS)))
+    if args.command == "ingest" and os.path.exists(args.rollup):
+        cube = merge_rollups(load_rollup(args.rollup), new_cube)
+    else:
+        cube = new_cube
+    save_rollup(cube, args.rollup)
+    print(f"{args.rollup}: {len(cube)} cells, "
+          f"{cube['order_day_only'].nunique()} days, {int(cube['rows'].sum())} rows")
+
+
+if __name__ == "__main__":
+    main()
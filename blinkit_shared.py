@@ -0,0 +1,180 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from blinkit_backend import load_backend
+from blinkit_store import PARQUET_PATH, apply_schema, read_table
+
+try:
+    import streamlit as st
+except ImportError:  # only the apps' watch_versions needs it, not publishing
+    st = None
+
+# -------------------------------------------------
+# SHARED DATASET LAYOUT
+# -------------------------------------------------
+# One publisher writes the canonical blinkit_data frame as an uncompressed
+# Arrow IPC file; every app memory-maps it, so the OS page cache holds a
+# single copy however many apps (and sessions) read it. The manifest names
+# the current file and its content version.
+SHARED_DIR = "blinkit_shared"
+DATASET = "blinkit_data"
+POLL_SECONDS = 30
+
+
+def manifest_path(name=DATASET, root=SHARED_DIR):
+    return os.path.join(root, f"{name}.json")
+
+
+# -------------------------------------------------
+# PUBLISH
+# -------------------------------------------------
+def file_version(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def load_canonical():
+    # Same source the dashboard used to read on its own: the Parquet copy if
+    # exported, otherwise the configured database
+    if os.path.exists(PARQUET_PATH):
+        return read_table(PARQUET_PATH)
+    backend = load_backend()
+    frame = apply_schema(backend.read_sql("SELECT * FROM blinkit_data"))
+    backend.close()
+    return frame
+
+
+def publish(frame, name=DATASET, root=SHARED_DIR, keep=2):
+    # Date-sorted before writing, so readers can use it without re-sorting
+    # (a sort would copy the whole frame and lose the zero-copy mapping)
+    os.makedirs(root, exist_ok=True)
+    if "order_day_only" in frame.columns:
+        frame = frame.sort_values("order_day_only", kind="stable")
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    tmp_path = os.path.join(root, f"{name}.arrow.tmp")
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    version = file_version(tmp_path)
+
+    manifest = read_manifest(name, root)
+    if manifest and manifest["version"] == version:
+        os.remove(tmp_path)
+        return manifest
+
+    data_path = os.path.join(root, f"{name}-{version}.arrow")
+    os.replace(tmp_path, data_path)
+    manifest = {
+        "version": version,
+        "file": os.path.basename(data_path),
+        "rows": table.num_rows,
+        "columns": table.column_names,
+        "published_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    tmp_manifest = manifest_path(name, root) + ".tmp"
+    with open(tmp_manifest, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_manifest, manifest_path(name, root))
+
+    # Older versions stay briefly for readers still mapping them
+    versions = sorted(glob.glob(os.path.join(root, f"{name}-*.arrow")), key=os.path.getmtime)
+    for old in versions[:-keep]:
+        os.remove(old)
+    return manifest
+
+
+# -------------------------------------------------
+# READ
+# -------------------------------------------------
+@lru_cache(maxsize=8)
+def cached_manifest(path, mtime_ns):
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_manifest(name=DATASET, root=SHARED_DIR):
+    path = manifest_path(name, root)
+    try:
+        return cached_manifest(path, os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+
+def published_ns(name=DATASET, root=SHARED_DIR):
+    # When the current version was published (the manifest's mtime), or None
+    try:
+        return os.stat(manifest_path(name, root)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def current_version(name=DATASET, root=SHARED_DIR):
+    # One stat per call; apps key their caches on this, so a publish makes
+    # every app reload on its next run
+    manifest = read_manifest(name, root)
+    return manifest["version"] if manifest else None
+
+
+def watch_versions(current, seen, poll_seconds=POLL_SECONDS):
+    # For the Streamlit apps: every poll_seconds, reruns an open session once
+    # current() no longer returns `seen`, the versions its caches were keyed on
+    # in this run (a publish, an ingested cube, a new model...)
+    @st.fragment(run_every=poll_seconds)
+    def watch():
+        if current() != seen:
+            st.rerun()
+
+    watch()
+
+
+def has_columns(columns, name=DATASET, root=SHARED_DIR):
+    manifest = read_manifest(name, root)
+    return manifest is not None and set(columns) <= set(manifest["columns"])
+
+
+def load_shared(columns=None, name=DATASET, root=SHARED_DIR):
+    # memory_map: column buffers point into the mapped file. Numeric columns
+    # without nulls stay zero-copy in pandas (split_blocks); categoricals only
+    # copy their small integer codes.
+    manifest = read_manifest(name, root)
+    if manifest is None:
+        raise FileNotFoundError(f"No shared {name} published under {root}/")
+    table = feather.read_table(os.path.join(root, manifest["file"]),
+                               columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Publish the shared Blinkit dataset for all apps")
+    parser.add_argument("command", choices=["publish", "serve"],
+                        help="publish once, or serve: republish every --every seconds")
+    parser.add_argument("--root", default=SHARED_DIR)
+    parser.add_argument("--every", type=int, default=300)
+    args = parser.parse_args()
+
+    while True:
+        start = time.perf_counter()
+        manifest = publish(load_canonical(), root=args.root)
+        print(f"{manifest['file']}: {manifest['rows']} rows, version {manifest['version']} "
+              f"({time.perf_counter() - start:.1f}s)")
+        if args.command == "publish":
+            break
+        # Unchanged data hashes to the same version, so apps only reload on real changes
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
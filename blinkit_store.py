@@ -0,0 +1,237 @@
+import argparse
+import os
+import shutil
+
+import pandas as pd
+
+# -------------------------------------------------
+# SOURCE TABLES
+# -------------------------------------------------
+# Table name -> CSV export it is loaded from
+SOURCE_TABLES = {
+    "blinkit_products": "Blinkit - blinkit_products.csv",
+    "blinkit_orders": "Blinkit - blinkit_orders.csv",
+    "blinkit_order_items": "Blinkit - blinkit_order_items.csv",
+    "blinkit_marketing_performance": "Blinkit - blinkit_marketing_performance.csv",
+    "blinkit_customers": "Blinkit - blinkit_customers.csv",
+    "blinkit_customer_feedback": "Blinkit - blinkit_customer_feedback.csv",
+}
+
+# Six-way join behind the chatbot / RAG analysis frame
+ANALYSIS_QUERY = """
+SELECT
+    o.order_date,
+    o.delivery_status,
+    o.order_total,
+    o.payment_method,
+
+    c.customer_name,
+    c.area,
+    c.pincode,
+    c.customer_segment,
+    c.total_orders,
+    c.avg_order_value,
+
+    p.product_name,
+    p.category,
+    p.brand,
+    p.price,
+    p.mrp,
+    p.margin_percentage,
+    p.shelf_life_days,
+
+    oi.quantity,
+    oi.unit_price,
+    (oi.quantity * oi.unit_price) AS item_total,
+
+    f.rating,
+    f.feedback_category,
+    f.sentiment,
+    f.feedback_text,
+
+    m.campaign_name,
+    m.channel,
+    m.target_audience,
+    m.spend,
+    m.revenue_generated,
+    m.roas
+
+FROM blinkit_orders o
+LEFT JOIN blinkit_customers c ON o.customer_id = c.customer_id
+LEFT JOIN blinkit_order_items oi ON o.order_id = oi.order_id
+LEFT JOIN blinkit_products p ON oi.product_id = p.product_id
+LEFT JOIN blinkit_customer_feedback f
+    ON o.order_id = f.order_id AND o.customer_id = f.customer_id
+LEFT JOIN blinkit_marketing_performance m
+    ON DATE(o.order_date) = m.date;
+"""
+
+# The columns ANALYSIS_QUERY returns, in order (all of them are also in blinkit_data)
+ANALYSIS_COLUMNS = [
+    "order_date", "delivery_status", "order_total", "payment_method",
+    "customer_name", "area", "pincode", "customer_segment", "total_orders", "avg_order_value",
+    "product_name", "category", "brand", "price", "mrp", "margin_percentage", "shelf_life_days",
+    "quantity", "unit_price", "item_total",
+    "rating", "feedback_category", "sentiment", "feedback_text",
+    "campaign_name", "channel", "target_audience", "spend", "revenue_generated", "roas",
+]
+
+# -------------------------------------------------
+# SCHEMA
+# -------------------------------------------------
+CSV_PATH = "blinkit_data.csv"
+PARQUET_PATH = "blinkit_data.parquet"
+PARTITION_COLUMN = "order_month"
+
+CATEGORY_COLUMNS = [
+    'area', 'brand', 'channel', 'sentiment', 'category', 'customer_segment',
+    'delivery_status', 'payment_method', 'feedback_category', 'campaign_name',
+    'target_audience', 'order_day_name', 'order_month_name', 'product_name',
+    'customer_name'
+]
+
+DATE_COLUMNS = ['order_day_only', 'promised_date', 'order_date']
+
+# Nullable ints survive the LEFT JOIN gaps; ratios go to float32 while money
+# stays float64 so revenue/spend totals match the SQL numbers to the rupee
+NUMERIC_DTYPES = {
+    'order_id': 'Int64',
+    'customer_id': 'Int64',
+    'product_id': 'Int64',
+    'delivery_partner_id': 'Int32',
+    'pincode': 'Int32',
+    'total_orders': 'Int32',
+    'quantity': 'Int16',
+    'shelf_life_days': 'Int16',
+    'order_hour': 'Int8',
+    'order_minutes': 'Int8',
+    'rating': 'Float32',
+    'margin_percentage': 'float32',
+    'roas': 'float32',
+    'delay_minutes': 'float32',
+    'order_total': 'float64',
+    'avg_order_value': 'float64',
+    'price': 'float64',
+    'mrp': 'float64',
+    'unit_price': 'float64',
+    'item_total': 'float64',
+    'spend': 'float64',
+    'revenue_generated': 'float64',
+}
+
+
+def apply_schema(frame):
+    for col in frame.columns:
+        if col in CATEGORY_COLUMNS:
+            frame[col] = frame[col].astype('category')
+        elif col in DATE_COLUMNS:
+            frame[col] = pd.to_datetime(frame[col])
+        elif col in NUMERIC_DTYPES:
+            dtype = NUMERIC_DTYPES[col]
+            values = pd.to_numeric(frame[col], errors='coerce')
+            if dtype[0] == 'I':
+                # Nullable ints refuse fractional values, so round first
+                values = values.round()
+            frame[col] = values.astype(dtype)
+    return frame
+
+
+def with_partition(frame):
+    for col in DATE_COLUMNS:
+        if col in frame.columns:
+            frame[PARTITION_COLUMN] = pd.to_datetime(frame[col]).dt.strftime('%Y-%m')
+            return frame
+    raise ValueError(f"Need one of {DATE_COLUMNS} to partition by month")
+
+
+# -------------------------------------------------
+# WRITE
+# -------------------------------------------------
+def write_parquet(frame, root, chunk_id=0):
+    # One directory per order month; chunk_id keeps files from separate
+    # chunks of the same month from overwriting each other
+    frame = with_partition(apply_schema(frame.copy()))
+    frame.to_parquet(
+        root,
+        engine="pyarrow",
+        index=False,
+        partition_cols=[PARTITION_COLUMN],
+        basename_template=f"part-{chunk_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def csv_to_parquet(csv_path, root, chunksize=500_000):
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    rows = 0
+    for chunk_id, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunksize)):
+        chunk = chunk.loc[:, ~chunk.columns.str.startswith("Unnamed")]
+        write_parquet(chunk, root, chunk_id=chunk_id)
+        rows += len(chunk)
+    return rows
+
+
+# -------------------------------------------------
+# READ
+# -------------------------------------------------
+def read_parquet(root, columns=None, filters=None):
+    frame = pd.read_parquet(root, engine="pyarrow", columns=columns, filters=filters)
+    if columns is None and PARTITION_COLUMN in frame.columns:
+        frame = frame.drop(columns=PARTITION_COLUMN)
+    return frame
+
+
+def apply_filters(frame, filters):
+    ops = {
+        '==': lambda s, v: s == v, '!=': lambda s, v: s != v,
+        '<': lambda s, v: s < v, '<=': lambda s, v: s <= v,
+        '>': lambda s, v: s > v, '>=': lambda s, v: s >= v,
+        'in': lambda s, v: s.isin(v),
+    }
+    mask = pd.Series(True, index=frame.index)
+    for col, op, value in filters:
+        if col in frame.columns:
+            mask &= ops[op](frame[col], value)
+    return frame[mask]
+
+
+def is_parquet(path):
+    return os.path.isdir(path) or path.endswith(".parquet")
+
+
+def read_table(path, columns=None, filters=None):
+    # Parquet gets projection and predicate pushdown; CSV is the fallback for
+    # trees that have not been converted yet
+    if is_parquet(path):
+        return read_parquet(path, columns=columns, filters=filters)
+    usecols = None
+    if columns is not None:
+        needed = set(columns) | {col for col, _, _ in filters or []}
+        usecols = lambda col: col in needed
+    frame = apply_schema(pd.read_csv(path, usecols=usecols))
+    if filters:
+        frame = apply_filters(frame, filters)
+    return frame[columns] if columns is not None else frame
+
+
+def default_dataset(parquet_path=PARQUET_PATH, csv_path=CSV_PATH):
+    return parquet_path if os.path.exists(parquet_path) else csv_path
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Convert a Blinkit CSV export to partitioned Parquet")
+    parser.add_argument("csv_path", nargs="?", default=CSV_PATH)
+    parser.add_argument("parquet_path", nargs="?", default=PARQUET_PATH)
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rows = csv_to_parquet(args.csv_path, args.parquet_path, chunksize=args.chunksize)
+    print(f"Wrote {rows} rows to {args.parquet_path}")
+
+
+if __name__ == "__main__":
+    main()
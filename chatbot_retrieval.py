@@ -0,0 +1,208 @@
+import re
+import threading
+
+import faiss
+import numpy as np
+import pandas as pd
+
+from dashboard_filters import FilterIndex
+
+# -------------------------------------------------
+# FILTERABLE METADATA
+# -------------------------------------------------
+# DataFrameLoader keeps every non-text column as document metadata; these are
+# the ones a question can pin down, plus the order date
+RETRIEVAL_DIMENSIONS = {
+    "area": "Area",
+    "pincode": "Pincode",
+    "category": "Category",
+    "channel": "Channel",
+    "sentiment": "Sentiment",
+}
+DATE_COLUMN = "order_date"
+
+# Channel names ("App", "Email") are everyday words, so they only count when
+# the question is about marketing
+DIMENSION_CUES = {"channel": ("channel", "channels", "campaign", "campaigns", "marketing", "ads")}
+SENTIMENT_WORDS = {
+    "negative": "Negative", "complain": "Negative", "complained": "Negative",
+    "complaint": "Negative", "complaints": "Negative", "unhappy": "Negative",
+    "positive": "Positive", "happy": "Positive", "praise": "Positive",
+    "neutral": "Neutral",
+}
+
+TOP_K = 5
+GATHER_ROWS = 20_000    # candidate sets up to this size are scored directly
+
+
+# -------------------------------------------------
+# DOCUMENT ORDER + INDEX
+# -------------------------------------------------
+def order_days(frame):
+    return pd.to_datetime(frame[DATE_COLUMN]).dt.normalize()
+
+
+def sort_by_day(frame):
+    # FilterIndex needs date-sorted rows, and document i of the vector store is
+    # row i of this frame, so the corpus is put in day order before embedding
+    days = order_days(frame)
+    if days.is_monotonic_increasing:
+        return frame
+    return frame.take(np.argsort(days.to_numpy(), kind="stable")).reset_index(drop=True)
+
+
+def build_document_index(frame):
+    keys = frame[list(RETRIEVAL_DIMENSIONS)].assign(order_day=order_days(frame))
+    return FilterIndex(keys, RETRIEVAL_DIMENSIONS, date_column="order_day")
+
+
+# -------------------------------------------------
+# QUESTION PARSING
+# -------------------------------------------------
+MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december"]
+ISO_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+LAST_N = re.compile(r"\b(?:last|past|previous)\s+(\d+)\s+(day|week|month)s?\b")
+LAST_ONE = re.compile(r"\b(?:last|past|previous)\s+(day|week|month)\b")
+THIS_PERIOD = re.compile(r"\bthis\s+(week|month)\b")
+MONTH_NAME = re.compile(
+    r"\b(?:(?:in|during|for|of|since)\s+(" + "|".join(MONTHS) + r")(?:\s+(\d{4}))?"
+    r"|(" + "|".join(MONTHS) + r")\s+(\d{4}))\b"
+)
+PERIOD_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+def match_values(text, values):
+    # Longest names first, and each match is blanked out, so "New Delhi"
+    # is not also read as "Delhi"
+    found = []
+    for value in sorted(values, key=lambda v: -len(str(v))):
+        pattern = r"\b" + re.escape(str(value).lower()) + r"\b"
+        if re.search(pattern, text):
+            found.append(value)
+            text = re.sub(pattern, " ", text)
+    return found, text
+
+
+def parse_dates(text, anchor):
+    # Relative periods count back from the newest order in the corpus (the
+    # data is historical, so "last week" means its last week, not today's)
+    dates = sorted(pd.Timestamp(d) for d in ISO_DATE.findall(text))
+    if dates:
+        return dates[0], dates[-1]
+    if re.search(r"\byesterday\b", text):
+        day = anchor - pd.Timedelta(days=1)
+        return day, day
+    if re.search(r"\btoday\b", text):
+        return anchor, anchor
+
+    match = LAST_N.search(text) or LAST_ONE.search(text)
+    if match:
+        count, unit = (int(match.group(1)), match.group(2)) if match.re is LAST_N else (1, match.group(1))
+        return anchor - pd.Timedelta(days=count * PERIOD_DAYS[unit] - 1), anchor
+    match = THIS_PERIOD.search(text)
+    if match:
+        start = anchor - pd.Timedelta(days=anchor.dayofweek) if match.group(1) == "week" else anchor.replace(day=1)
+        return start, anchor
+    match = MONTH_NAME.search(text)
+    if match:
+        name, year = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+        month = MONTHS.index(name) + 1
+        # Without a year: the latest such month up to the anchor
+        year = int(year) if year else anchor.year - (month > anchor.month)
+        start = pd.Timestamp(year=year, month=month, day=1)
+        return start, start + pd.offsets.MonthEnd(0)
+    return None, None
+
+
+def parse_question(question, index):
+    text = question.lower()
+    filters = {}
+    for dim in RETRIEVAL_DIMENSIONS:
+        cues = DIMENSION_CUES.get(dim)
+        if cues and not any(re.search(rf"\b{cue}\b", text) for cue in cues):
+            continue
+        if dim == "pincode":
+            known = set(index.options(dim))
+            codes = [int(code) for code in re.findall(r"\b(\d{6})\b", text)]
+            found = [code for code in codes if code in known]
+        else:
+            found, text = match_values(text, index.options(dim))
+        if dim == "sentiment" and not found:
+            words = {SENTIMENT_WORDS[w] for w in re.findall(r"[a-z]+", text) if w in SENTIMENT_WORDS}
+            found = [value for value in index.options(dim) if value in words]
+        if found:
+            filters[dim] = found
+
+    days = index.dates[~np.isnat(index.dates)]
+    anchor = pd.Timestamp(days[-1]) if len(days) else pd.Timestamp.today().normalize()
+    start, end = parse_dates(text, anchor)
+    return {"filters": filters, "start": start, "end": end}
+
+
+def describe(constraints):
+    parts = [f"{RETRIEVAL_DIMENSIONS[dim]}: {', '.join(map(str, values))}"
+             for dim, values in constraints["filters"].items()]
+    if constraints["start"] is not None:
+        parts.append(f"{constraints['start']:%Y-%m-%d} → {constraints['end']:%Y-%m-%d}")
+    return " · ".join(parts)
+
+
+# -------------------------------------------------
+# FILTERED SEARCH
+# -------------------------------------------------
+def nearest(index, query, rows, k=TOP_K, gather_rows=GATHER_ROWS):
+    # Exact L2 over the candidate rows only. Small sets: gather their vectors
+    # and score them here. Large sets: FAISS with a bitmap selector, which
+    # skips the distance computation for every row outside the set.
+    rows = np.asarray(rows, dtype="int64")
+    if len(rows) <= gather_rows:
+        vectors = index.reconstruct_batch(rows)
+        distances = ((vectors - query) ** 2).sum(axis=1)
+        best = np.argpartition(distances, k)[:k] if len(rows) > k else np.arange(len(rows))
+        return rows[best[np.argsort(distances[best], kind="stable")]]
+
+    mask = np.zeros(index.ntotal, dtype=bool)
+    mask[rows] = True
+    bitmap = np.packbits(mask, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+    _, ids = index.search(query[None, :], k, params=faiss.SearchParameters(sel=selector))
+    return ids[0][ids[0] >= 0]
+
+
+class FilteredRetriever:
+    # Questions without recognisable constraints keep the plain top-k search.
+    # Shared by all sessions: the index and FAISS searches are read-only, and
+    # the embedder is used by one thread at a time (Hugging Face fast
+    # tokenizers fail with "Already borrowed" when called concurrently).
+
+    def __init__(self, vectorstore, index, k=TOP_K):
+        self.vectorstore = vectorstore
+        self.index = index
+        self.k = k
+        self.embed_lock = threading.Lock()
+
+    def embed(self, question):
+        with self.embed_lock:
+            return np.asarray(self.vectorstore.embeddings.embed_query(question), dtype="float32")
+
+    def search(self, question):
+        # Returns the documents, the parsed constraints and how many
+        # documents were searched
+        constraints = parse_question(question, self.index)
+        total = self.vectorstore.index.ntotal
+        if not constraints["filters"] and constraints["start"] is None:
+            query = self.embed(question)
+            return self.vectorstore.similarity_search_by_vector(query.tolist(), k=self.k), constraints, total
+
+        start = constraints["start"] if constraints["start"] is not None else pd.Timestamp.min
+        end = constraints["end"] if constraints["end"] is not None else pd.Timestamp.max
+        rows = self.index.select(start, end, constraints["filters"])
+        if len(rows) == 0:
+            return [], constraints, 0
+
+        query = self.embed(question)
+        ids = nearest(self.vectorstore.index, query, rows, self.k)
+        docstore_ids = self.vectorstore.index_to_docstore_id
+        docs = [self.vectorstore.docstore.search(docstore_ids[int(i)]) for i in ids]
+        return docs, constraints, len(rows)
@@ -0,0 +1,90 @@
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from langchain_community.embeddings import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
+
+try:
+    from langchain_groq import ChatGroq
+except ImportError:  # only needed for answers, not for the search load test
+    ChatGroq = None
+
+# -------------------------------------------------
+# MODELS (one instance per process, see blinkit_chatbot.py)
+# -------------------------------------------------
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
+LLM_MODEL = "llama-3.1-8b-instant"
+
+
+def make_embeddings():
+    return HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+
+
+class HashEmbeddings(Embeddings):
+    # Offline stand-in for the sentence-transformer (load tests, machines
+    # without the model): hashed bag of words of the same width
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+
+    def vector(self, text):
+        vector = np.zeros(self.dim, dtype="float32")
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % self.dim] += 1
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self.vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self.vector(text)
+
+
+def make_llm(api_key):
+    # The Groq client keeps one HTTP connection pool and is safe to share
+    # between session threads
+    if ChatGroq is None:
+        raise ImportError("Answering needs `pip install langchain-groq`")
+    return ChatGroq(groq_api_key=api_key, model_name=LLM_MODEL, temperature=0)
+
+
+# -------------------------------------------------
+# BOUNDED SEARCH POOL
+# -------------------------------------------------
+SEARCH_WORKERS = 4      # query embeddings + vector searches running at once
+QUEUE_SIZE = 16         # further requests allowed to wait for a worker
+QUEUE_TIMEOUT = 10      # seconds a request waits for a slot before it is turned away
+
+
+class BoundedPool:
+    # A ThreadPoolExecutor queues without limit, so under load every session
+    # would wait behind an ever longer backlog. A semaphore over workers +
+    # queue_size slots makes a full pool push back instead: callers wait up to
+    # `timeout` seconds for a slot, then get a TimeoutError they can show as
+    # "busy, try again".
+
+    def __init__(self, workers=SEARCH_WORKERS, queue_size=QUEUE_SIZE, name="chatbot-search"):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.capacity = workers + queue_size
+        self.slots = threading.BoundedSemaphore(self.capacity)
+
+    def submit(self, fn, *args, timeout=QUEUE_TIMEOUT):
+        if not self.slots.acquire(timeout=timeout):
+            raise TimeoutError(f"All {self.capacity} search slots stayed busy for {timeout}s")
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def run(self, fn, *args, timeout=QUEUE_TIMEOUT):
+        return self.submit(fn, *args, timeout=timeout).result()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
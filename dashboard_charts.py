@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# DEFAULT LIMITS (overridable from the dashboard sidebar)
+# -------------------------------------------------
+MAX_BARS = 25           # top-N bars, the rest become one "Other" bar
+MAX_POINTS = 500        # time series longer than this are LTTB-downsampled
+WEBGL_POINTS = 1000     # traces with more points than this render with WebGL
+
+
+# -------------------------------------------------
+# TOP-N + OTHER
+# -------------------------------------------------
+def top_n_bars(frame, label, value, n=MAX_BARS, means=()):
+    # Keeps the n - 1 largest bars by `value` and folds the rest into one
+    # "Other (k more)" bar: summed columns stay sums, `means` are averaged
+    if len(frame) <= n:
+        return frame
+    ranked = frame.sort_values(value, ascending=False, kind="stable")
+    top, rest = ranked.iloc[:n - 1], ranked.iloc[n - 1:]
+
+    other = {label: f"Other ({len(rest)} more)"}
+    for col in frame.columns.drop(label):
+        if pd.api.types.is_numeric_dtype(frame[col]):
+            other[col] = rest[col].mean() if col in means else rest[col].sum()
+    # Labels become text so numeric ids and the Other bar share a category axis
+    top = top.astype({label: "str"})
+    return pd.concat([top, pd.DataFrame([other])], ignore_index=True)
+
+
+# -------------------------------------------------
+# LTTB DOWNSAMPLING
+# -------------------------------------------------
+def lttb_indices(x, y, threshold):
+    # Largest-Triangle-Three-Buckets: first and last point, plus per bucket the
+    # point forming the largest triangle with the previous pick and the next
+    # bucket's mean, which keeps peaks and dips a stride sample would drop
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype="float64")
+    y = np.nan_to_num(np.asarray(y, dtype="float64"))
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    picked = np.empty(threshold, dtype=np.intp)
+    picked[0], picked[-1] = 0, n - 1
+    prev = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        next_x, next_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs(
+            (x[prev] - next_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (next_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        picked[i + 1] = prev
+    return picked
+
+
+def downsample(frame, x, ys, threshold=MAX_POINTS):
+    # Union of the points LTTB keeps for each series, so every line keeps its shape
+    if len(frame) <= threshold:
+        return frame
+    xs = frame[x]
+    xs = xs.astype("int64") if pd.api.types.is_datetime64_any_dtype(xs) else xs
+    keep = np.unique(np.concatenate([lttb_indices(xs, frame[y], threshold) for y in ys]))
+    return frame.iloc[keep]
+
+
+# -------------------------------------------------
+# PERIOD BUCKETS (bars)
+# -------------------------------------------------
+PERIODS = [("W", "weekly"), ("M", "monthly"), ("Q", "quarterly"), ("Y", "yearly")]
+
+
+def bucket_bars(frame, x, ys, threshold=MAX_POINTS):
+    # LTTB keeps a line's shape but would silently drop whole bars, so a long
+    # daily bar series is summed into the finest period that fits under the
+    # threshold instead. Returns the frame and the period's name.
+    if len(frame) <= threshold:
+        return frame, "daily"
+    days = pd.DatetimeIndex(frame[x])
+    for freq, name in PERIODS:
+        periods = days.to_period(freq)
+        if periods.nunique() <= threshold or freq == PERIODS[-1][0]:
+            bucketed = frame[ys].groupby(periods).sum(min_count=1)
+            bucketed.index = bucketed.index.to_timestamp()
+            return bucketed.rename_axis(x).reset_index(), name
+
+
+# -------------------------------------------------
+# WEBGL SWITCH
+# -------------------------------------------------
+def render_mode(points, webgl_points=WEBGL_POINTS):
+    # Called with the number of points actually plotted, after downsampling
+    return "webgl" if points > webgl_points else "svg"
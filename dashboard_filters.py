@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# -------------------------------------------------
+# CROSS-FILTER DIMENSIONS
+# -------------------------------------------------
+FILTER_DIMENSIONS = {
+    "area": "Area",
+    "channel": "Channel",
+    "category": "Category",
+    "customer_segment": "Customer Segment",
+    "sentiment": "Sentiment",
+}
+
+
+# -------------------------------------------------
+# SORTED-CODE INDEX
+# -------------------------------------------------
+class FilterIndex:
+    # Built once over the date-sorted cached frame. Per dimension it keeps the
+    # category code of every row plus, per value, the sorted row positions
+    # holding it. A selection starts from the smallest posting list and checks
+    # the other dimensions by code lookup, so its cost follows the number of
+    # matching rows rather than the frame size.
+
+    def __init__(self, frame, dimensions=FILTER_DIMENSIONS, date_column="order_day_only"):
+        self.dates = frame[date_column].to_numpy()
+        self.codes = {}
+        self.postings = {}
+        self.lookup = {}
+        for dim in dimensions:
+            column = frame[dim].astype("category")
+            codes = column.cat.codes.to_numpy()
+            values = list(column.cat.categories)
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+            self.codes[dim] = codes
+            self.lookup[dim] = {value: i for i, value in enumerate(values)}
+            self.postings[dim] = {
+                value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(values)
+            }
+
+    def options(self, dim):
+        return list(self.postings[dim])
+
+    def date_bounds(self, start_date, end_date):
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), side="left")
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), side="right")
+        return lo, hi
+
+    def select(self, start_date, end_date, filters):
+        # Row positions inside the date range matching every filter
+        # (values within one dimension are OR-ed, dimensions are AND-ed)
+        lo, hi = self.date_bounds(start_date, end_date)
+        active = {dim: [v for v in values if v in self.lookup[dim]]
+                  for dim, values in filters.items() if values}
+        if not active:
+            return np.arange(lo, hi)
+
+        sizes = {dim: sum(len(self.postings[dim][v]) for v in values)
+                 for dim, values in active.items()}
+        driver = min(sizes, key=sizes.get)
+        rows = np.sort(np.concatenate(
+            [self.postings[driver][v] for v in active[driver]] or [np.array([], dtype=np.intp)]
+        ))
+        rows = rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)]
+
+        for dim, values in active.items():
+            if dim == driver:
+                continue
+            wanted = np.zeros(len(self.lookup[dim]) + 1, dtype=bool)
+            wanted[[self.lookup[dim][v] for v in values]] = True
+            # Missing values have code -1, which lands on the spare False slot
+            rows = rows[wanted[self.codes[dim][rows]]]
+        return rows
+
+
+# -------------------------------------------------
+# GROUP-BY SPECS (one definition, SQL or in-memory)
+# -------------------------------------------------
+# aggs maps output column -> (function, source column)
+SQL_FUNCTIONS = {
+    "count": "COUNT({})",
+    "distinct": "COUNT(DISTINCT {})",
+    "sum": "SUM({})",
+    "avg": "AVG({})",
+}
+PANDAS_FUNCTIONS = {"count": "count", "distinct": "nunique", "sum": "sum", "avg": "mean"}
+
+
+def aggregate_sql(by, aggs, start_date, end_date):
+    select = list(by) + [
+        f"{SQL_FUNCTIONS[func].format(col)} AS {name}" for name, (func, col) in aggs.items()
+    ]
+    query = f"""
+    SELECT {', '.join(select)}
+    FROM blinkit_data
+    WHERE order_day_only BETWEEN '{start_date}' AND '{end_date}'
+    """
+    if by:
+        query += f"GROUP BY {', '.join(by)}\n"
+    return query
+
+
+def frame_aggregate(frame, rows, by, aggs):
+    columns = list(dict.fromkeys(list(by) + [col for _, col in aggs.values()]))
+    part = frame[columns].take(rows)
+    if not by:
+        return pd.DataFrame({
+            name: [getattr(part[col], PANDAS_FUNCTIONS[func])()]
+            for name, (func, col) in aggs.items()
+        })
+    named = {name: pd.NamedAgg(column=col, aggfunc=PANDAS_FUNCTIONS[func])
+             for name, (func, col) in aggs.items()}
+    return (part.groupby(list(by), observed=True, dropna=False, sort=False)
+                .agg(**named)
+                .reset_index())
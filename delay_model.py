@@ -0,0 +1,191 @@
+import json
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from blinkit_store import is_parquet, read_parquet
+
+# -------------------------------------------------
+# FEATURES (same order fill_defaults() assembles them)
+# -------------------------------------------------
+MANAGER_INPUTS = ['order_hour', 'order_day_name', 'order_month_name', 'area', 'pincode']
+
+FEATURE_COLUMNS = MANAGER_INPUTS + [
+    'delivery_status', 'order_total', 'total_orders', 'avg_order_value',
+    'category', 'brand', 'quantity', 'price', 'item_total', 'channel',
+    'target_audience', 'spend', 'payment_method', 'customer_segment',
+    'rating', 'sentiment', 'order_minutes'
+]
+
+CATEGORICAL_FEATURES = ['order_day_name', 'order_month_name', 'area', 'pincode',
+                        'delivery_status', 'category', 'brand', 'channel',
+                        'target_audience', 'payment_method', 'customer_segment', 'sentiment']
+NUMERIC_FEATURES = [col for col in FEATURE_COLUMNS if col not in CATEGORICAL_FEATURES]
+
+TARGET = 'delay_minutes'
+DATE_COLUMN = 'order_day_only'
+
+DAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_ORDER = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+
+CATEGORICAL_DEFAULTS = ['category', 'brand', 'channel', 'target_audience', 'payment_method',
+                        'customer_segment', 'sentiment', 'delivery_status']
+INT_MEDIAN_DEFAULTS = ['quantity', 'total_orders', 'order_minutes']
+MEDIAN_DEFAULTS = ['rating', 'order_total', 'avg_order_value', 'price', 'item_total', 'spend']
+
+REFERENCE_COLUMNS = (['area', 'pincode', 'order_day_name', 'order_month_name']
+                     + CATEGORICAL_DEFAULTS + INT_MEDIAN_DEFAULTS + MEDIAN_DEFAULTS)
+
+
+# -------------------------------------------------
+# STREAMING FEATURE FRAME
+# -------------------------------------------------
+def read_feature_frame(path, chunksize=200_000):
+    # Chunked read: each chunk is shrunk to categoricals / float32 before the
+    # next one is parsed, so peak memory stays close to the compact frame size
+    usecols = FEATURE_COLUMNS + [TARGET, DATE_COLUMN]
+    if is_parquet(path):
+        # Parquet is already compact and column-projected: one "chunk"
+        source = [read_parquet(path, columns=usecols)]
+    else:
+        source = pd.read_csv(path, usecols=usecols, chunksize=chunksize)
+
+    chunks = []
+    for chunk in source:
+        chunk = chunk.dropna(subset=[TARGET])
+        for col in CATEGORICAL_FEATURES:
+            chunk[col] = chunk[col].astype('category')
+        for col in NUMERIC_FEATURES + [TARGET]:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype('float32')
+        chunk[DATE_COLUMN] = pd.to_datetime(chunk[DATE_COLUMN])
+        chunks.append(chunk)
+
+    if not chunks:
+        raise ValueError(f"No labelled rows in {path}")
+
+    frame = pd.DataFrame({
+        col: (union_categoricals([c[col] for c in chunks])
+              if col in CATEGORICAL_FEATURES
+              else np.concatenate([c[col].to_numpy() for c in chunks]))
+        for col in usecols
+    })
+
+    # Time order drives the CV splits and the recent-window holdouts
+    return frame.sort_values(DATE_COLUMN, kind='stable').reset_index(drop=True)
+
+
+# -------------------------------------------------
+# DEFAULTS PROFILE
+# -------------------------------------------------
+def ordered_domain(values, order):
+    # Calendar order first, anything unexpected appended in sorted order
+    present = set(values)
+    return [v for v in order if v in present] + sorted(present.difference(order))
+
+
+def to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def build_reference(ml_data):
+    pairs = ml_data[['area', 'pincode']].dropna().drop_duplicates()
+    area_pincodes = {
+        area: sorted(to_python(p) for p in group['pincode'])
+        for area, group in pairs.groupby('area', sort=True, observed=True)
+    }
+
+    # Most frequent / median values from training data
+    defaults = {col: to_python(ml_data[col].mode()[0]) for col in CATEGORICAL_DEFAULTS}
+    defaults.update({col: int(ml_data[col].median()) for col in INT_MEDIAN_DEFAULTS})
+    defaults.update({col: float(ml_data[col].median()) for col in MEDIAN_DEFAULTS})
+
+    return {
+        'areas': list(area_pincodes),
+        'area_pincodes': area_pincodes,
+        'day_names': ordered_domain(ml_data['order_day_name'].dropna().unique(), DAY_ORDER),
+        'month_names': ordered_domain(ml_data['order_month_name'].dropna().unique(), MONTH_ORDER),
+        'defaults': defaults,
+    }
+
+
+def save_profile(profile, path):
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+
+
+def load_profile(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def fill_defaults(defaults, area, pincode, order_hour, order_day_name, order_month_name):
+    # Scalars give the single-row frame the calculator needs; equal-length
+    # arrays give one row per combination (used for batch scoring)
+    input_data = pd.DataFrame({
+        'order_hour': np.atleast_1d(order_hour),
+        'order_day_name': np.atleast_1d(order_day_name),
+        'order_month_name': np.atleast_1d(order_month_name),
+        'area': np.atleast_1d(area),
+        'pincode': np.atleast_1d(pincode),
+    })
+    for col in FEATURE_COLUMNS[len(MANAGER_INPUTS):]:
+        input_data[col] = defaults[col]
+    return input_data[FEATURE_COLUMNS]
+
+
+# -------------------------------------------------
+# RISK LEVELS
+# -------------------------------------------------
+RISK_LEVELS = ["Low Risk", "Medium Risk", "High Risk"]
+
+
+def assess_risk(predicted_minutes):
+    # Only delay matters: early deliveries count as zero minutes of delay.
+    # Works on scalars or arrays; returns RISK_LEVELS codes and percentages.
+    display_minutes = np.maximum(np.asarray(predicted_minutes, dtype=float), 0)
+    levels = np.select([display_minutes > 30, display_minutes > 15], [2, 1], default=0)
+    percentages = np.minimum(np.round(display_minutes / 60 * 100, 2), 100)
+    return levels.astype(np.uint8), percentages
+
+
+# -------------------------------------------------
+# PIPELINE
+# -------------------------------------------------
+def build_pipeline(n_jobs=1, random_state=42):
+    preprocess = ColumnTransformer(
+        [("categorical", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES)],
+        remainder="passthrough"
+    )
+    model = RandomForestRegressor(n_jobs=n_jobs, random_state=random_state)
+    return Pipeline([("preprocess", preprocess), ("model", model)])
+
+
+def build_correction_pipeline(alpha=1.0):
+    # Lightweight residual model for recent windows: one-hot + ridge fits in seconds
+    preprocess = ColumnTransformer(
+        [("categorical", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES)],
+        remainder="passthrough"
+    )
+    return Pipeline([("preprocess", preprocess), ("model", Ridge(alpha=alpha))])
+
+
+class ResidualCorrectedModel:
+    # Forest trained on the full history plus a small model of its recent residuals
+
+    def __init__(self, base, correction):
+        self.base = base
+        self.correction = correction
+
+    def predict(self, X):
+        return self.base.predict(X) + self.correction.predict(X)
+
+
+def base_pipeline(model):
+    return model.base if isinstance(model, ResidualCorrectedModel) else model
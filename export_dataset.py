@@ -0,0 +1,180 @@
+import argparse
+import bz2
+import gzip
+import os
+import shutil
+import time
+
+from blinkit_backend import CONFIG_PATH, load_backend
+from blinkit_store import ANALYSIS_QUERY, is_parquet, write_parquet
+
+try:
+    import resource
+except ImportError:  # not on Windows; the report then leaves out peak memory
+    resource = None
+
+# -------------------------------------------------
+# DEFAULTS
+# -------------------------------------------------
+EXPORT_PATH = "blinkit_analysis_data.parquet"   # what blinkit_chatbot.py reads
+CHUNK_ROWS = 100_000
+CSV_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "none": open}
+CSV_SUFFIXES = {".gz": "gzip", ".bz2": "bz2"}
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def disk_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(folder, name))
+               for folder, _, names in os.walk(path) for name in names)
+
+
+def remove_path(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def replace_path(tmp_path, out):
+    # os.replace can't put a directory over an existing one, so the previous
+    # export is moved aside and only removed once the new one is in place
+    old_path = out + ".old"
+    remove_path(old_path)
+    if os.path.exists(out):
+        os.replace(out, old_path)
+    os.replace(tmp_path, out)
+    remove_path(old_path)
+
+
+def csv_compression(out, compression="infer"):
+    # From the suffix (.gz, .bz2, else none); an explicit choice must agree
+    # with it, so a .csv is never written compressed or a .gz plain
+    inferred = CSV_SUFFIXES.get(os.path.splitext(out)[1].lower(), "none")
+    if compression == "infer":
+        return inferred
+    if compression != inferred:
+        raise ValueError(f"{out} does not match --compression {compression} "
+                         f"(expected {inferred}); rename it or use --compression infer")
+    return compression
+
+
+# -------------------------------------------------
+# WRITERS
+# -------------------------------------------------
+# Each takes the chunk iterator and writes a chunk before the next one is
+# fetched, so memory holds one chunk whatever the size of the join. Both
+# write to out + ".tmp" and swap it in at the end, so a failed export leaves
+# the previous one intact.
+def write_csv_chunks(chunks, out, compression):
+    tmp_path = out + ".tmp"
+    try:
+        with CSV_OPENERS[compression](tmp_path, "wt", newline="", encoding="utf-8") as handle:
+            for chunk_id, chunk in enumerate(chunks):
+                chunk.to_csv(handle, header=chunk_id == 0, index=False)
+                yield chunk_id, len(chunk)
+    except BaseException:
+        remove_path(tmp_path)
+        raise
+    os.replace(tmp_path, out)
+
+
+def write_parquet_chunks(chunks, out):
+    # Same month-partitioned layout (and dtypes) as write_parquet / csv_to_parquet
+    tmp_path = out + ".tmp"
+    remove_path(tmp_path)
+    os.makedirs(tmp_path)
+    try:
+        for chunk_id, chunk in enumerate(chunks):
+            write_parquet(chunk, tmp_path, chunk_id=chunk_id)
+            yield chunk_id, len(chunk)
+    except BaseException:
+        remove_path(tmp_path)
+        raise
+    replace_path(tmp_path, out)
+
+
+# -------------------------------------------------
+# EXPORT
+# -------------------------------------------------
+def export(backend, out=EXPORT_PATH, query=ANALYSIS_QUERY, fmt=None,
+           chunk_rows=CHUNK_ROWS, compression="infer", progress=print):
+    fmt = fmt or ("parquet" if is_parquet(out) else "csv")
+    if fmt == "csv":
+        compression = csv_compression(out, compression)
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    chunks = backend.read_sql_chunks(query, chunk_rows)
+    if fmt == "parquet":
+        written = write_parquet_chunks(chunks, out)
+    else:
+        written = write_csv_chunks(chunks, out, compression)
+
+    start = time.perf_counter()
+    rows = chunk_count = 0
+    for chunk_id, chunk_len in written:
+        rows += chunk_len
+        chunk_count = chunk_id + 1
+        elapsed = time.perf_counter() - start
+        if progress:
+            peak = peak_memory_mb()
+            progress(f"chunk {chunk_count}: {rows:,} rows, {rows / max(elapsed, 1e-9):,.0f} rows/s"
+                     + (f", peak memory {peak:,.0f} MB" if peak is not None else ""))
+
+    seconds = time.perf_counter() - start
+    return {
+        "path": out,
+        "format": fmt,
+        "rows": rows,
+        "chunks": chunk_count,
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / max(seconds, 1e-9)),
+        "bytes": disk_bytes(out) if os.path.exists(out) else 0,
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stream the joined Blinkit dataset from the database to compressed CSV or Parquet"
+    )
+    parser.add_argument("out", nargs="?", default=EXPORT_PATH,
+                        help="*.parquet (month-partitioned directory) or *.csv[.gz]")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Default: from the output name")
+    parser.add_argument("--table", default=None,
+                        help="Export SELECT * FROM this table instead of the six-way join")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--compression", choices=["infer"] + sorted(CSV_OPENERS), default="infer",
+                        help="CSV only, default from the suffix (.gz, .bz2); Parquet files use snappy")
+    parser.add_argument("--config", default=CONFIG_PATH)
+    args = parser.parse_args()
+
+    if (args.format or ("parquet" if is_parquet(args.out) else "csv")) == "csv":
+        try:
+            csv_compression(args.out, args.compression)
+        except ValueError as e:
+            parser.error(str(e))
+
+    query = f"SELECT * FROM {args.table}" if args.table else ANALYSIS_QUERY
+    backend = load_backend(args.config)
+    try:
+        report = export(backend, args.out, query, fmt=args.format,
+                        chunk_rows=args.chunk_rows, compression=args.compression)
+    finally:
+        backend.close()
+
+    print(f"Wrote {report['rows']:,} rows in {report['chunks']} chunks to {report['path']} "
+          f"({report['bytes'] / 1e6:,.1f} MB, {report['seconds']}s, {report['rows_per_second']:,} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import argparse
+import os
+import re
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+
+from blinkit_documents import clean_text
+from blinkit_store import default_dataset, read_table
+
+try:
+    from chatbot_service import HashEmbeddings, make_embeddings
+except ImportError:  # only the build needs an embedder; the apps just read the summaries
+    HashEmbeddings = make_embeddings = None
+
+# -------------------------------------------------
+# INSIGHT LAYOUT
+# -------------------------------------------------
+# clusters.parquet: one row per feedback theme within a feedback_category x
+#   sentiment group (centroid, size, share, nearest example texts)
+# daily.parquet: feedback count per order day and theme, so any date range
+#   can be re-summed without the raw rows
+INSIGHTS_PATH = "blinkit_feedback_insights"
+SOURCE_COLUMNS = ["order_id", "order_day_only", "feedback_category", "sentiment", "feedback_text"]
+GROUP_COLUMNS = ["feedback_category", "sentiment"]
+
+CLUSTERS = 5        # themes per feedback_category x sentiment
+EXAMPLES = 3        # representative texts kept per theme
+BATCH_SIZE = 1024   # mini-batch k-means batch
+
+
+# -------------------------------------------------
+# BUILD
+# -------------------------------------------------
+def feedback_rows(frame):
+    # The joined table repeats an order's feedback on every item row: one per order
+    rows = frame[SOURCE_COLUMNS].dropna(subset=["feedback_text"]).drop_duplicates("order_id")
+    rows = rows.assign(
+        order_day_only=pd.to_datetime(rows["order_day_only"]).dt.normalize(),
+        feedback_category=rows["feedback_category"].astype("object").fillna("Unknown").astype(str),
+        sentiment=rows["sentiment"].astype("object").fillna("Unknown").astype(str),
+        clean_feedback=rows["feedback_text"].map(clean_text),
+    )
+    return rows[rows["clean_feedback"] != ""]
+
+
+def cluster_group(vectors, weights, clusters, seed):
+    clusters = min(clusters, len(vectors))
+    if clusters == 1:
+        return np.zeros(len(vectors), dtype=int), np.average(vectors, axis=0, weights=weights)[None, :]
+    model = MiniBatchKMeans(n_clusters=clusters, batch_size=BATCH_SIZE, n_init=3, random_state=seed)
+    return model.fit_predict(vectors, sample_weight=weights), model.cluster_centers_
+
+
+def build_insights(frame, embeddings, clusters=CLUSTERS, examples=EXAMPLES, seed=42):
+    rows = feedback_rows(frame)
+
+    # Feedback is highly repetitive: each distinct cleaned text is embedded
+    # once and clustered with its frequency as the sample weight
+    texts = (rows.groupby(GROUP_COLUMNS + ["clean_feedback"], sort=False)
+                 .agg(count=("order_id", "size"), example=("feedback_text", "first"))
+                 .reset_index())
+    unique = texts["clean_feedback"].unique()
+    vectors = np.asarray(embeddings.embed_documents(list(unique)), dtype="float32")
+    texts["vector"] = pd.Series(np.arange(len(unique)), index=unique)[texts["clean_feedback"]].to_numpy()
+    texts["cluster_id"] = -1
+
+    themes = []
+    for (category, sentiment), group in texts.groupby(GROUP_COLUMNS, sort=True):
+        group_vectors = vectors[group["vector"].to_numpy()]
+        labels, centers = cluster_group(group_vectors, group["count"].to_numpy(), clusters, seed)
+        for label in np.unique(labels):
+            members = group[labels == label]
+            distances = ((group_vectors[labels == label] - centers[label]) ** 2).sum(axis=1)
+            nearest = members["example"].iloc[np.argsort(distances, kind="stable")[:examples]].tolist()
+            cluster_id = len(themes)
+            texts.loc[members.index, "cluster_id"] = cluster_id
+            themes.append({
+                "cluster_id": cluster_id,
+                "feedback_category": category,
+                "sentiment": sentiment,
+                "label": nearest[0],
+                "size": int(members["count"].sum()),
+                "examples": nearest,
+                "centroid": centers[label].astype("float32").tolist(),
+            })
+
+    themes = pd.DataFrame(themes)
+    themes["share"] = themes["size"] / themes.groupby(GROUP_COLUMNS)["size"].transform("sum")
+
+    rows = rows.merge(texts[GROUP_COLUMNS + ["clean_feedback", "cluster_id"]],
+                      on=GROUP_COLUMNS + ["clean_feedback"])
+    daily = (rows.groupby(["order_day_only", "cluster_id"]).size()
+                 .rename("count").reset_index()
+                 .sort_values(["order_day_only", "cluster_id"], kind="stable")
+                 .reset_index(drop=True))
+    return {"clusters": themes, "daily": daily}
+
+
+def save_insights(insights, path=INSIGHTS_PATH):
+    os.makedirs(path, exist_ok=True)
+    for name, table in insights.items():
+        target = os.path.join(path, f"{name}.parquet")
+        table.to_parquet(target + ".tmp", engine="pyarrow", index=False)
+        os.replace(target + ".tmp", target)
+
+
+def load_insights(path=INSIGHTS_PATH):
+    return {name: pd.read_parquet(os.path.join(path, f"{name}.parquet"), engine="pyarrow")
+            for name in ("clusters", "daily")}
+
+
+def insights_version(path=INSIGHTS_PATH):
+    # Apps key their cache on this; None when nothing has been built
+    target = os.path.join(path, "daily.parquet")
+    return os.stat(target).st_mtime_ns if os.path.exists(target) else None
+
+
+# -------------------------------------------------
+# QUERY
+# -------------------------------------------------
+def matches(column, values):
+    # Case-insensitive, like the rollup's sentiment filter
+    return column.str.lower().isin({str(v).lower() for v in values})
+
+
+def reason_counts(insights, start_date=None, end_date=None, sentiments=None, categories=None):
+    # Themes ranked by feedback count in the date range, with each theme's
+    # share of all feedback selected
+    daily = insights["daily"]
+    days = daily["order_day_only"]
+    lo = 0 if start_date is None else days.searchsorted(pd.Timestamp(start_date), side="left")
+    hi = len(daily) if end_date is None else days.searchsorted(pd.Timestamp(end_date), side="right")
+    counts = daily.iloc[lo:hi].groupby("cluster_id")["count"].sum()
+
+    themes = insights["clusters"].set_index("cluster_id")
+    result = themes.loc[counts.index].assign(count=counts.to_numpy())
+    if sentiments:
+        result = result[matches(result["sentiment"], sentiments)]
+    if categories:
+        result = result[matches(result["feedback_category"], categories)]
+    result = result[result["count"] > 0].sort_values("count", ascending=False, kind="stable")
+    result["share"] = result["count"] / result["count"].sum()
+    return result.reset_index()[["cluster_id", "feedback_category", "sentiment", "label",
+                                 "count", "share", "examples"]]
+
+
+def daily_counts(insights, start_date, end_date, sentiments=None, by="feedback_category"):
+    daily = insights["daily"].merge(insights["clusters"][["cluster_id", "feedback_category", "sentiment"]],
+                                    on="cluster_id")
+    daily = daily[daily["order_day_only"].between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+    if sentiments:
+        daily = daily[matches(daily["sentiment"], sentiments)]
+    return (daily.pivot_table(index="order_day_only", columns=by, values="count",
+                              aggfunc="sum", fill_value=0)
+                 .reset_index())
+
+
+def reason_summary(reasons, n=5):
+    # Compact LLM context: the whole selection in a few lines
+    total = int(reasons["count"].sum())
+    lines = [f"{total:,} feedback records in total, grouped into themes:"]
+    for rank, row in enumerate(reasons.head(n).itertuples(), start=1):
+        quotes = "; ".join(f'"{text}"' for text in row.examples)
+        lines.append(f"{rank}. {row.feedback_category} / {row.sentiment}: {row.count:,} "
+                     f"({row.share:.0%}), e.g. {quotes}")
+    return "\n".join(lines)
+
+
+# -------------------------------------------------
+# CHATBOT
+# -------------------------------------------------
+ASKS_WHY = re.compile(r"\b(why|reasons?|causes?)\b")
+ABOUT_FEEDBACK = re.compile(r"\b(feedback|complain\w*|complaints?|reviews?|unhappy|dissatisf\w*)\b")
+# Themes are not broken down by these, so questions naming one of their
+# values, or asking which one ("which area had the most complaints?"), go to
+# vector search
+UNSUPPORTED_FILTERS = ("area", "pincode", "category", "channel")
+ASKS_WHICH = re.compile(
+    r"\b(which|what|where)\s+(areas?|pincodes?|categor(y|ies)|channels?|products?|brands?)\b"
+)
+
+
+def insight_context(insights, question, constraints):
+    # "What is the common reason for negative feedback?" and the like, answered
+    # from every feedback record in range instead of five retrieved rows.
+    # Returns (context, scope, records) or None when retrieval should answer.
+    text = question.lower()
+    if not (ASKS_WHY.search(text) and ABOUT_FEEDBACK.search(text)) or ASKS_WHICH.search(text):
+        return None
+    if any(dim in constraints["filters"] for dim in UNSUPPORTED_FILTERS):
+        return None
+
+    categories = [c for c in insights["clusters"]["feedback_category"].unique()
+                  if re.search(r"\b" + re.escape(c.lower()) + r"\b", text)]
+    sentiments = constraints["filters"].get("sentiment")
+    reasons = reason_counts(insights, constraints["start"], constraints["end"], sentiments, categories)
+    if reasons.empty:
+        return None
+
+    scope = [f"Sentiment: {', '.join(sentiments)}"] if sentiments else []
+    if categories:
+        scope.append(f"Feedback category: {', '.join(categories)}")
+    if constraints["start"] is not None:
+        scope.append(f"{constraints['start']:%Y-%m-%d} → {constraints['end']:%Y-%m-%d}")
+    return reason_summary(reasons), " · ".join(scope), int(reasons["count"].sum())
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Cluster customer feedback into themes for the chatbot and dashboard")
+    parser.add_argument("data", nargs="?", default=default_dataset())
+    parser.add_argument("--out", default=INSIGHTS_PATH)
+    parser.add_argument("--clusters", type=int, default=CLUSTERS, help="Themes per feedback category x sentiment")
+    parser.add_argument("--examples", type=int, default=EXAMPLES)
+    parser.add_argument("--embedder", choices=["hf", "hash"], default="hf",
+                        help="hf: the chatbot's sentence-transformer; hash: offline bag-of-words stand-in")
+    args = parser.parse_args()
+
+    if make_embeddings is None:
+        parser.error("Building needs the chatbot's dependencies (langchain-community)")
+    embeddings = make_embeddings() if args.embedder == "hf" else HashEmbeddings()
+
+    insights = build_insights(read_table(args.data, columns=SOURCE_COLUMNS), embeddings,
+                              clusters=args.clusters, examples=args.examples)
+    save_insights(insights, args.out)
+    themes, daily = insights["clusters"], insights["daily"]
+    print(f"{args.out}: {len(themes)} themes over {int(themes['size'].sum())} feedback records, "
+          f"{daily['order_day_only'].nunique()} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from langchain_community.document_loaders import DataFrameLoader
+from langchain_community.vectorstores import FAISS
+
+from blinkit_backend import Backend
+from blinkit_documents import add_document_text
+from blinkit_store import ANALYSIS_QUERY
+from chatbot_retrieval import FilteredRetriever, build_document_index, sort_by_day
+from chatbot_service import (QUEUE_SIZE, QUEUE_TIMEOUT, SEARCH_WORKERS, BoundedPool, HashEmbeddings,
+                             make_embeddings, make_llm)
+from synthetic_data import generate
+
+
+# -------------------------------------------------
+# CORPUS
+# -------------------------------------------------
+def build_retriever(args):
+    workdir = args.workdir or tempfile.mkdtemp(prefix="blinkit-load-")
+    db_path = os.path.join(workdir, "blinkit.db")
+    generate(db_path, orders=args.orders, seed=args.seed)
+    backend = Backend({"backend": "sqlite", "path": db_path})
+    frame = sort_by_day(backend.read_sql(ANALYSIS_QUERY)).head(args.docs).reset_index(drop=True)
+    backend.close()
+    frame = add_document_text(frame)
+
+    embeddings = make_embeddings() if args.embedder == "hf" else HashEmbeddings()
+    start = time.perf_counter()
+    documents = DataFrameLoader(frame, page_content_column="full_text").load()
+    vectorstore = FAISS.from_documents(documents, embeddings)
+    build_seconds = time.perf_counter() - start
+    return FilteredRetriever(vectorstore, build_document_index(frame)), len(frame), build_seconds
+
+
+# -------------------------------------------------
+# QUESTIONS
+# -------------------------------------------------
+def make_questions(index, rng, count):
+    # Mix of filtered and whole-corpus questions, like real chat traffic
+    areas, categories = index.options("area"), index.options("category")
+    templates = [
+        lambda: f"negative feedback in {rng.choice(areas)} last week",
+        lambda: f"why are {rng.choice(categories)} sales down this month",
+        lambda: f"positive reviews in {rng.choice(areas)} in the last 30 days",
+        lambda: "how are social media campaigns performing",
+        lambda: "what do customers complain about most",
+        lambda: "which products have the best margins",
+    ]
+    return [rng.choice(templates)() for _ in range(count)]
+
+
+# -------------------------------------------------
+# SESSIONS
+# -------------------------------------------------
+def run_session(pool, retriever, questions, think, queue_timeout, llm, rng, result):
+    # One simulated chat session: ask, wait for the answer, "read" it, ask again
+    for question in questions:
+        start = time.perf_counter()
+        try:
+            docs, _, _ = pool.run(retriever.search, question, timeout=queue_timeout)
+        except TimeoutError:
+            result["rejected"] += 1
+            continue
+        if llm is not None:
+            context = "\n".join(doc.page_content for doc in docs)
+            llm.invoke(f"Data:\n{context}\n\nQuestion:\n{question}\n\nAnswer in at most 5 lines.")
+        result["latencies"].append(time.perf_counter() - start)
+        if think:
+            time.sleep(rng.expovariate(1 / think))
+
+
+def load_level(retriever, sessions, args, llm):
+    pool = BoundedPool(workers=args.workers, queue_size=args.queue_size)
+    rng = random.Random(args.seed)
+    results = [{"latencies": [], "rejected": 0} for _ in range(sessions)]
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(pool, retriever, make_questions(retriever.index, rng, args.questions),
+                  args.think, args.queue_timeout, llm, random.Random(args.seed + i), results[i]),
+        )
+        for i in range(sessions)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    pool.shutdown()
+
+    latencies = np.array([t for r in results for t in r["latencies"]])
+    report = {
+        "sessions": sessions,
+        "requests": sessions * args.questions,
+        "completed": len(latencies),
+        "rejected": sum(r["rejected"] for r in results),
+        "seconds": round(seconds, 3),
+        "throughput_per_second": round(len(latencies) / max(seconds, 1e-9), 1),
+    }
+    if len(latencies):
+        for pct in (50, 95, 99):
+            report[f"p{pct}_ms"] = round(float(np.percentile(latencies, pct)) * 1000, 2)
+        report["max_ms"] = round(float(latencies.max()) * 1000, 2)
+    return report
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent chatbot sessions against the shared search pool")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 8, 32],
+                        help="Concurrent sessions; several values run one level each")
+    parser.add_argument("--questions", type=int, default=20, help="Questions per session")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean pause between a session's questions (s)")
+    parser.add_argument("--workers", type=int, default=SEARCH_WORKERS)
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE)
+    parser.add_argument("--queue-timeout", type=float, default=QUEUE_TIMEOUT)
+    parser.add_argument("--orders", type=int, default=5_000)
+    parser.add_argument("--docs", type=int, default=20_000, help="Documents to embed")
+    parser.add_argument("--embedder", choices=["hf", "hash"], default="hash",
+                        help="hf: the chatbot's sentence-transformer; hash: offline stand-in")
+    parser.add_argument("--llm", action="store_true", help="Also call Groq per question (needs GROQ_API_KEY)")
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="load_test_results.json")
+    args = parser.parse_args()
+
+    llm = None
+    if args.llm:
+        if not os.environ.get("GROQ_API_KEY"):
+            parser.error("--llm needs the GROQ_API_KEY environment variable")
+        llm = make_llm(os.environ["GROQ_API_KEY"])
+
+    retriever, docs, build_seconds = build_retriever(args)
+    print(f"{docs:,} documents embedded and indexed in {build_seconds:.1f}s ({args.embedder})")
+
+    levels = []
+    for sessions in args.sessions:
+        report = load_level(retriever, sessions, args, llm)
+        levels.append(report)
+        print(f"{sessions:>4} sessions: {report['completed']:,}/{report['requests']:,} answered, "
+              f"{report['rejected']} rejected, {report['throughput_per_second']}/s, "
+              f"p50 {report.get('p50_ms')} ms, p95 {report.get('p95_ms')} ms, p99 {report.get('p99_ms')} ms")
+
+    with open(args.out, "w") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "documents": docs,
+                "embedder": args.embedder,
+                "llm": args.llm,
+                "workers": args.workers,
+                "queue_size": args.queue_size,
+                "queue_timeout": args.queue_timeout,
+                "questions_per_session": args.questions,
+                "think_seconds": args.think,
+                "python": platform.python_version(),
+                "cpu_count": os.cpu_count(),
+            },
+            "levels": levels,
+        }, f, indent=2)
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
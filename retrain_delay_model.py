@@ -0,0 +1,169 @@
+import argparse
+import os
+import pickle
+import time
+
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from delay_model import (
+    DATE_COLUMN, FEATURE_COLUMNS, TARGET, ResidualCorrectedModel, base_pipeline,
+    build_correction_pipeline, load_profile, read_feature_frame, save_profile
+)
+from risk_table import TABLE_PATH, load_reference, load_risk_table
+
+
+# -------------------------------------------------
+# RECENT-WINDOW SPLIT
+# -------------------------------------------------
+def split_recent(frame, holdout_days, holdout_fraction=0.2):
+    # The most recent days are never trained on; they decide promotion. A
+    # batch spanning no more than holdout_days (e.g. one night's new orders)
+    # holds out its latest holdout_fraction of rows instead; the frame is
+    # already in time order.
+    cutoff = frame[DATE_COLUMN].max() - pd.Timedelta(days=holdout_days)
+    train_part = frame[frame[DATE_COLUMN] <= cutoff]
+    holdout = frame[frame[DATE_COLUMN] > cutoff]
+    if train_part.empty:
+        split = len(frame) - max(1, round(len(frame) * holdout_fraction))
+        train_part, holdout = frame.iloc[:split], frame.iloc[split:]
+    if train_part.empty or holdout.empty:
+        raise ValueError(f"Need labelled rows both to train on and to hold out "
+                         f"({len(frame)} rows, holdout of {holdout_days} days)")
+    return train_part, holdout
+
+
+# -------------------------------------------------
+# RETRAINING MODES
+# -------------------------------------------------
+def warm_start(model, train_part, add_trees, alpha, correction_fraction=0.2):
+    # Grow the existing forest with trees fitted on the new orders only. The
+    # fitted encoder is reused so the old trees keep their feature layout;
+    # categories it has never seen are ignored by the one-hot step.
+    corrected = isinstance(model, ResidualCorrectedModel)
+    tree_part, correction_part = train_part, None
+    if corrected:
+        # The old correction modelled the old forest's residuals, so it is
+        # refitted on the grown one, on the latest training rows the new trees
+        # don't see (their residuals on their own rows are near zero). The
+        # holdout is left to score the result.
+        split = len(train_part) - max(1, round(len(train_part) * correction_fraction))
+        if split < 1:
+            raise ValueError(f"Need at least 2 training rows to grow the forest and refit "
+                             f"its correction ({len(train_part)} rows)")
+        tree_part, correction_part = train_part.iloc[:split], train_part.iloc[split:]
+
+    pipeline = base_pipeline(model)
+    encoded = pipeline[:-1].transform(tree_part[FEATURE_COLUMNS])
+    forest = pipeline[-1]
+    forest.set_params(warm_start=True, n_estimators=forest.n_estimators + add_trees)
+    forest.fit(encoded, tree_part[TARGET])
+    forest.set_params(warm_start=False)
+    if corrected:
+        return fit_correction(pipeline, correction_part, alpha)
+    return pipeline
+
+
+def fit_correction(model, train_part, alpha):
+    # Only ever given training rows: the holdout that decides promotion stays unseen
+    pipeline = base_pipeline(model)
+    X = train_part[FEATURE_COLUMNS]
+    residuals = train_part[TARGET] - pipeline.predict(X)
+    correction = build_correction_pipeline(alpha=alpha).fit(X, residuals)
+    return ResidualCorrectedModel(pipeline, correction)
+
+
+def holdout_mae(model, holdout):
+    return mean_absolute_error(holdout[TARGET], model.predict(holdout[FEATURE_COLUMNS]))
+
+
+def retrain(model_path, data_path, mode="warm-start", holdout_days=7, add_trees=50,
+            alpha=1.0, tolerance=0.0, chunksize=200_000, holdout_fraction=0.2):
+    report = {"mode": mode}
+    start = time.perf_counter()
+
+    frame = read_feature_frame(data_path, chunksize=chunksize)
+    train_part, holdout = split_recent(frame, holdout_days, holdout_fraction)
+    report["train_rows"], report["holdout_rows"] = len(train_part), len(holdout)
+
+    with open(model_path, "rb") as f:
+        current_bytes = f.read()
+    current = pickle.loads(current_bytes)
+    candidate = pickle.loads(current_bytes)
+
+    fit_start = time.perf_counter()
+    if mode == "warm-start":
+        candidate = warm_start(candidate, train_part, add_trees, alpha, holdout_fraction)
+    else:
+        candidate = fit_correction(candidate, train_part, alpha)
+    report["fit_seconds"] = round(time.perf_counter() - fit_start, 2)
+
+    report["current_mae"] = round(holdout_mae(current, holdout), 3)
+    report["candidate_mae"] = round(holdout_mae(candidate, holdout), 3)
+    report["promoted"] = bool(report["candidate_mae"] <= report["current_mae"] * (1 + tolerance))
+
+    if report["promoted"]:
+        # Write-then-rename so readers never load a half-written pickle
+        tmp_path = model_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(candidate, f)
+        os.replace(tmp_path, model_path)
+
+    report["total_seconds"] = round(time.perf_counter() - start, 2)
+    return report
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally retrain the delivery-delay model")
+    parser.add_argument("--data", required=True, help="CSV of newly ingested orders")
+    parser.add_argument("--model", default="blinkit_best__model.pkl")
+    parser.add_argument("--profile", default="blinkit_model_defaults.json")
+    parser.add_argument("--table", default=TABLE_PATH, help="Risk calculator lookup table")
+    parser.add_argument("--mode", choices=["warm-start", "correction"], default="warm-start")
+    parser.add_argument("--holdout-days", type=int, default=7)
+    parser.add_argument("--holdout-fraction", type=float, default=0.2,
+                        help="Share of the latest rows held out when --data spans no more than --holdout-days; "
+                             "also the share of training rows a warm-start refits the correction on")
+    parser.add_argument("--add-trees", type=int, default=50)
+    parser.add_argument("--alpha", type=float, default=1.0,
+                        help="Ridge penalty of the correction (also refitted by warm-start on a corrected model)")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Allowed relative MAE increase on the holdout window")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    args = parser.parse_args()
+
+    if not 0 < args.holdout_fraction < 1:
+        parser.error("--holdout-fraction must be between 0 and 1")
+
+    try:
+        report = retrain(
+            args.model,
+            args.data,
+            mode=args.mode,
+            holdout_days=args.holdout_days,
+            add_trees=args.add_trees,
+            alpha=args.alpha,
+            tolerance=args.tolerance,
+            chunksize=args.chunksize,
+            holdout_fraction=args.holdout_fraction,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if os.path.exists(args.profile):
+        profile = load_profile(args.profile)
+        profile["last_retrain"] = report
+        save_profile(profile, args.profile)
+    if report["promoted"]:
+        # Refresh the risk calculator's table for the promoted model up front
+        load_risk_table(args.model, load_reference(args.profile), args.table)
+
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
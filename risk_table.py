@@ -0,0 +1,222 @@
+import argparse
+import functools
+import hashlib
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+from blinkit_shared import current_version, has_columns, load_shared
+from blinkit_store import default_dataset, read_table
+from delay_model import (RISK_LEVELS, REFERENCE_COLUMNS, assess_risk, build_reference,
+                         fill_defaults, load_profile)
+
+HOURS = 24
+MODEL_PATH = "blinkit_best__model.pkl"
+PROFILE_PATH = "blinkit_model_defaults.json"
+TABLE_PATH = "blinkit_risk_table.npz"
+
+
+# -------------------------------------------------
+# MODEL / REFERENCE VERSIONS
+# -------------------------------------------------
+@functools.lru_cache(maxsize=8)
+def _file_digest(path, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def file_digest(path):
+    # Content hash, only recomputed when the file's mtime/size change
+    stat = os.stat(path)
+    return _file_digest(path, stat.st_mtime_ns, stat.st_size)
+
+
+def model_version(model_path):
+    return file_digest(model_path)
+
+
+def load_model(model_path):
+    with open(model_path, "rb") as f:
+        return pickle.load(f)
+
+
+# Everything in the reference profile the grid is computed from
+GRID_KEYS = ["areas", "area_pincodes", "day_names", "month_names", "defaults"]
+
+
+def table_version(model_path, reference):
+    # The grid changes with the model and with the dropdown domains / default
+    # inputs, so both go into the key (training reports in the profile don't)
+    grid = json.dumps({key: reference[key] for key in GRID_KEYS}, sort_keys=True, default=str)
+    return f"{model_version(model_path)}-{hashlib.sha256(grid.encode()).hexdigest()[:16]}"
+
+
+def reference_version(profile_path=PROFILE_PATH):
+    # Changes whenever load_reference would return something else: the
+    # profile's content hash when it exists, else the shared dataset version
+    if os.path.exists(profile_path):
+        return f"profile-{file_digest(profile_path)}"
+    return f"data-{current_version()}"
+
+
+def load_reference(profile_path=PROFILE_PATH, data_path=None):
+    # Prefer the profile exported next to the model; otherwise derive it from
+    # the shared dataset or a column-projected read (the frame is dropped on return)
+    if os.path.exists(profile_path):
+        return load_profile(profile_path)
+    if current_version() is not None and has_columns(REFERENCE_COLUMNS):
+        return build_reference(load_shared(REFERENCE_COLUMNS))
+    return build_reference(read_table(data_path or default_dataset(), columns=REFERENCE_COLUMNS))
+
+
+# -------------------------------------------------
+# PRECOMPUTED GRID
+# -------------------------------------------------
+def grid_domains(reference):
+    pairs = [(area, pincode)
+             for area in reference['areas']
+             for pincode in reference['area_pincodes'][area]]
+    return pairs, list(reference['day_names']), list(reference['month_names'])
+
+
+def build_arrays(model, reference, pairs_per_batch=50):
+    pairs, day_names, month_names = grid_domains(reference)
+    shape = (len(pairs), HOURS, len(day_names), len(month_names))
+    minutes = np.empty(shape, dtype=np.float32)
+
+    # Grid positions in C order, so each batch of pairs fills a contiguous block
+    hour_idx, day_idx, month_idx = (
+        a.ravel() for a in np.meshgrid(np.arange(HOURS), np.arange(shape[2]),
+                                       np.arange(shape[3]), indexing="ij")
+    )
+    cells = len(hour_idx)
+    days, months = np.array(day_names, dtype=object), np.array(month_names, dtype=object)
+
+    flat = minutes.reshape(len(pairs), cells)
+    for start in range(0, len(pairs), pairs_per_batch):
+        batch = pairs[start:start + pairs_per_batch]
+        areas = np.repeat(np.array([a for a, _ in batch], dtype=object), cells)
+        pincodes = np.repeat(np.array([p for _, p in batch]), cells)
+        inputs = fill_defaults(
+            reference['defaults'], areas, pincodes,
+            np.tile(hour_idx, len(batch)), np.tile(days[day_idx], len(batch)),
+            np.tile(months[month_idx], len(batch))
+        )
+        flat[start:start + len(batch)] = model.predict(inputs).reshape(len(batch), cells)
+
+    levels, percentages = assess_risk(minutes)
+    return {
+        "minutes": minutes,
+        "levels": levels,
+        "percentages": percentages.astype(np.float32),
+        "areas": np.array([a for a, _ in pairs], dtype=str),
+        "pincodes": np.array([p for _, p in pairs]),
+        "day_names": np.array(day_names, dtype=str),
+        "month_names": np.array(month_names, dtype=str),
+    }
+
+
+def save_arrays(arrays, version, path):
+    tmp_path = path + ".tmp.npz"
+    np.savez_compressed(tmp_path, version=np.array(version), **arrays)
+    os.replace(tmp_path, path)
+
+
+def table_stamp(path=TABLE_PATH):
+    # The stored table's mtime, or None; apps key on it to pick up an offline build
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+def load_arrays(path, version):
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as data:
+        if str(data["version"]) != version:
+            return None
+        return {key: data[key] for key in data.files if key != "version"}
+
+
+# -------------------------------------------------
+# LOOKUP
+# -------------------------------------------------
+class RiskTable:
+    # arrays is None when no table matches the model and reference: every
+    # input then goes through the fallback
+
+    def __init__(self, arrays, model, defaults, cache_size=4096):
+        self.arrays = arrays
+        self.model = model
+        self.defaults = defaults
+        grid = arrays if arrays is not None else {
+            "areas": [], "pincodes": [], "day_names": [], "month_names": []
+        }
+        self.pair_index = {
+            (str(area), pincode.item()): i
+            for i, (area, pincode) in enumerate(zip(grid["areas"], grid["pincodes"]))
+        }
+        self.day_index = {str(d): i for i, d in enumerate(grid["day_names"])}
+        self.month_index = {str(m): i for i, m in enumerate(grid["month_names"])}
+        # Anything outside the grid is scored once and remembered
+        self.fallback = functools.lru_cache(maxsize=cache_size)(self._predict_one)
+
+    def _predict_one(self, area, pincode, order_hour, order_day_name, order_month_name):
+        inputs = fill_defaults(self.defaults, area, pincode, order_hour,
+                               order_day_name, order_month_name)
+        predicted_minutes = float(self.model.predict(inputs)[0])
+        level, percentage = assess_risk(predicted_minutes)
+        return predicted_minutes, RISK_LEVELS[int(level)], float(percentage)
+
+    def predict(self, area, pincode, order_hour, order_day_name, order_month_name):
+        # Returns (predicted_minutes, risk_level, risk_percentage)
+        pair = self.pair_index.get((area, pincode))
+        day = self.day_index.get(order_day_name)
+        month = self.month_index.get(order_month_name)
+        if pair is None or day is None or month is None or not 0 <= order_hour < HOURS:
+            return self.fallback(area, pincode, order_hour, order_day_name, order_month_name)
+
+        cell = (pair, order_hour, day, month)
+        return (float(self.arrays["minutes"][cell]),
+                RISK_LEVELS[self.arrays["levels"][cell]],
+                round(float(self.arrays["percentages"][cell]), 2))
+
+
+def load_risk_table(model_path, reference, table_path=TABLE_PATH, build=True):
+    # Rebuilt whenever the model or the reference grid differ from the stored
+    # ones, by training, a promoting retrain or main. The app passes
+    # build=False: a stale table is never rebuilt (or overwritten) inside a
+    # request, predictions fall back to the model until the offline build lands.
+    version = table_version(model_path, reference)
+    model = load_model(model_path)
+    arrays = load_arrays(table_path, version)
+    if arrays is None and build:
+        arrays = build_arrays(model, reference)
+        save_arrays(arrays, version, table_path)
+    return RiskTable(arrays, model, reference['defaults'])
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the risk calculator's delay table offline")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--profile", default=PROFILE_PATH)
+    parser.add_argument("--data", default=None, help="Reference source when there is no profile")
+    parser.add_argument("--table", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    table = load_risk_table(args.model, load_reference(args.profile, args.data), args.table)
+    print(f"{args.table}: {table.arrays['minutes'].size:,} cells for {len(table.pair_index):,} "
+          f"area/pincode pairs ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+import argparse
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from blinkit_backend import Backend
+from blinkit_store import SOURCE_TABLES, write_parquet
+
+# -------------------------------------------------
+# VOCABULARY
+# -------------------------------------------------
+START_DATE = "2024-01-01"
+
+CATEGORIES = [
+    "Dairy & Breakfast", "Fruits & Vegetables", "Snacks & Munchies", "Instant & Frozen Food",
+    "Cold Drinks & Juices", "Bakery & Biscuits", "Household Care", "Personal Care",
+    "Pet Care", "Baby Care", "Pharmacy"
+]
+CHANNELS = ["App", "Email", "SMS", "Social Media"]
+TARGET_AUDIENCES = ["All", "New Users", "Premium", "Inactive"]
+CAMPAIGNS = [
+    "Weekend Special", "Flash Sale", "New User Discount", "Festival Offer", "Free Delivery",
+    "Combo Deals", "Monsoon Sale", "Midnight Cravings", "Healthy Living", "Referral Bonus"
+]
+SEGMENTS = ["Regular", "Premium", "New", "Inactive"]
+SEGMENT_WEIGHTS = [0.5, 0.15, 0.25, 0.1]
+PAYMENT_METHODS = ["UPI", "Card", "Cash", "Wallet"]
+PAYMENT_WEIGHTS = [0.55, 0.2, 0.15, 0.1]
+
+FEEDBACK_TEXT = {
+    "Delivery": {
+        "Positive": ["Delivery was super quick", "Rider was polite and on time"],
+        "Neutral": ["Delivery took the usual time", "Order arrived as expected"],
+        "Negative": ["Late delivery again", "Order arrived much later than promised"],
+    },
+    "Product Quality": {
+        "Positive": ["Fresh and good quality products", "Great product, will buy again"],
+        "Neutral": ["Product quality was okay", "Average quality for the price"],
+        "Negative": ["Vegetables were not fresh", "Received an expired product"],
+    },
+    "Customer Service": {
+        "Positive": ["Support resolved my issue fast", "Very helpful customer care"],
+        "Neutral": ["Support replied after some time", "Customer care was fine"],
+        "Negative": ["Customer care did not respond", "Refund is still pending"],
+    },
+    "App Experience": {
+        "Positive": ["App is easy to use", "Smooth checkout in the app"],
+        "Neutral": ["App works fine", "Search could be better"],
+        "Negative": ["App crashed during payment", "Coupon did not apply in the app"],
+    },
+    "Packaging": {
+        "Positive": ["Neatly packed order", "Packaging kept everything safe"],
+        "Neutral": ["Packaging was normal", "Items were packed okay"],
+        "Negative": ["Items were damaged in packaging", "Milk packet was leaking"],
+    },
+}
+FEEDBACK_CATEGORIES = list(FEEDBACK_TEXT)
+
+# Share of a day's orders placed in each hour (morning and evening peaks)
+HOUR_WEIGHTS = np.array([
+    0.3, 0.2, 0.1, 0.1, 0.1, 0.3, 1.0, 2.5, 4.0, 4.5, 3.5, 3.0,
+    3.2, 3.0, 2.5, 2.5, 3.0, 4.0, 5.5, 6.5, 6.0, 4.5, 2.5, 1.0
+])
+HOUR_WEIGHTS = HOUR_WEIGHTS / HOUR_WEIGHTS.sum()
+PEAK_HOURS = [8, 9, 18, 19, 20]
+
+
+# -------------------------------------------------
+# SCALE
+# -------------------------------------------------
+def cardinalities(orders):
+    # Dimension tables grow sub-linearly with orders, like the real export
+    # (5k orders: ~2.5k customers, ~270 products, a few hundred partners)
+    root = int(np.sqrt(orders))
+    products = int(np.clip(2 * root, 268, 50_000))
+    return {
+        "customers": int(np.clip(orders // 2, 200, 5_000_000)),
+        "products": products,
+        "brands": max(20, products // 5),
+        "areas": int(np.clip(root // 2, 20, 2_000)),
+        "partners": int(np.clip(orders // 20, 50, 200_000)),
+        "stores": int(np.clip(orders // 5_000, 5, 2_000)),
+    }
+
+
+def popularity(rng, n, shape=0.6):
+    # Heavy-tailed weights: a few customers / products take most of the orders
+    weights = rng.gamma(shape, size=n)
+    return weights / weights.sum()
+
+
+# -------------------------------------------------
+# DIMENSION TABLES
+# -------------------------------------------------
+def build_dimensions(rng, orders, days, campaigns_per_day):
+    sizes = cardinalities(orders)
+    start = pd.Timestamp(START_DATE)
+
+    n_areas = sizes["areas"]
+    areas = np.array([f"Area {i:04d}" for i in range(1, n_areas + 1)], dtype=object)
+    area_base_pincode = 110001 + np.arange(n_areas) * 3
+    area_delay = rng.gamma(2.0, 1.5, size=n_areas)
+
+    n_products = sizes["products"]
+    brands = np.array([f"Brand {i:03d}" for i in range(1, sizes["brands"] + 1)], dtype=object)
+    price = np.round(np.exp(rng.normal(4.6, 0.9, size=n_products)).clip(10, 2_000), 2)
+    products = pd.DataFrame({
+        "product_id": np.arange(1, n_products + 1),
+        "product_name": [f"Product {i:05d}" for i in range(1, n_products + 1)],
+        "category": rng.choice(CATEGORIES, size=n_products),
+        "brand": rng.choice(brands, size=n_products),
+        "price": price,
+        "mrp": np.round(price * rng.uniform(1.0, 1.3, size=n_products), 2),
+        "margin_percentage": np.round(rng.uniform(5, 40, size=n_products), 2),
+        "shelf_life_days": rng.integers(1, 730, size=n_products),
+        "min_stock_level": rng.integers(5, 30, size=n_products),
+        "max_stock_level": rng.integers(50, 300, size=n_products),
+    })
+
+    n_rows = days * campaigns_per_day
+    impressions = rng.integers(1_000, 100_000, size=n_rows)
+    clicks = (impressions * rng.uniform(0.01, 0.05, size=n_rows)).astype(int)
+    spend = np.round(impressions * rng.uniform(0.05, 0.2, size=n_rows), 2)
+    revenue = np.round(spend * np.exp(rng.normal(0.7, 0.5, size=n_rows)), 2)
+    marketing = pd.DataFrame({
+        "campaign_id": np.arange(1, n_rows + 1),
+        "campaign_name": rng.choice(CAMPAIGNS, size=n_rows),
+        "date": start + pd.to_timedelta(np.repeat(np.arange(days), campaigns_per_day), unit="D"),
+        "target_audience": rng.choice(TARGET_AUDIENCES, size=n_rows),
+        "channel": rng.choice(CHANNELS, size=n_rows),
+        "impressions": impressions,
+        "clicks": clicks,
+        "conversions": (clicks * rng.uniform(0.05, 0.2, size=n_rows)).astype(int),
+        "spend": spend,
+        "revenue_generated": revenue,
+        "roas": np.round(revenue / spend, 2),
+    })
+
+    # Customers are kept as compact per-id arrays; the text columns are only
+    # materialised chunk by chunk when the customers table is written
+    n_customers = sizes["customers"]
+    customer_of_order = rng.choice(n_customers, size=orders, p=popularity(rng, n_customers))
+    customer_area = rng.integers(0, n_areas, size=n_customers)
+    customers = {
+        "count": n_customers,
+        "area": customer_area,
+        "pincode": area_base_pincode[customer_area] + rng.integers(0, 3, size=n_customers),
+        "segment": rng.choice(len(SEGMENTS), size=n_customers, p=SEGMENT_WEIGHTS),
+        "total_orders": np.bincount(customer_of_order, minlength=n_customers),
+        "avg_order_value": np.round(np.exp(rng.normal(6.3, 0.5, size=n_customers)), 2),
+        "registration_day": rng.integers(-730, days, size=n_customers),
+    }
+
+    return {
+        "sizes": sizes,
+        "start": start,
+        "days": days,
+        "areas": areas,
+        "area_delay": area_delay,
+        "products": products,
+        "product_weights": popularity(rng, n_products),
+        "marketing": marketing,
+        "customers": customers,
+        "customer_of_order": customer_of_order,
+    }
+
+
+def customers_table(dims, lo, hi):
+    ids = np.arange(lo, hi)
+    c = dims["customers"]
+    return pd.DataFrame({
+        "customer_id": ids + 1,
+        "customer_name": [f"Customer {i:07d}" for i in ids + 1],
+        "email": [f"customer{i}@example.com" for i in ids + 1],
+        "phone": 9_000_000_000 + ids + 1,
+        "address": [f"House {i % 500 + 1}" for i in ids],
+        "area": dims["areas"][c["area"][ids]],
+        "pincode": c["pincode"][ids],
+        "registration_date": dims["start"] + pd.to_timedelta(c["registration_day"][ids], unit="D"),
+        "customer_segment": np.array(SEGMENTS, dtype=object)[c["segment"][ids]],
+        "total_orders": c["total_orders"][ids],
+        "avg_order_value": c["avg_order_value"][ids],
+    })
+
+
+# -------------------------------------------------
+# FACT TABLES (one chunk of order ids)
+# -------------------------------------------------
+def fact_chunk(rng, dims, lo, hi, total_orders, feedback_rate):
+    n = hi - lo
+    order_ids = np.arange(lo, hi) + 1
+    customer_ids = dims["customer_of_order"][lo:hi] + 1
+    area_codes = dims["customers"]["area"][customer_ids - 1]
+
+    # Orders are spread evenly over the period in id order, so a chunk is a
+    # run of consecutive days and the month partitions stay contiguous
+    day = (np.arange(lo, hi) * dims["days"]) // total_orders
+    hour = rng.choice(24, size=n, p=HOUR_WEIGHTS)
+    minute = rng.integers(0, 60, size=n)
+    order_date = (dims["start"] + pd.to_timedelta(day, unit="D")
+                  + pd.to_timedelta(hour, unit="h") + pd.to_timedelta(minute, unit="m"))
+    promised = order_date + pd.to_timedelta(rng.integers(8, 20, size=n), unit="m")
+
+    late = rng.random(size=n) < 0.45
+    delay = np.where(
+        late,
+        rng.gamma(1.5, 5.0, size=n) + np.isin(hour, PEAK_HOURS) * 4 + dims["area_delay"][area_codes],
+        rng.normal(-1.5, 1.5, size=n),
+    ).round()
+    status = np.where(delay <= 2, "On Time", np.where(delay <= 10, "Slightly Delayed", "Significantly Delayed"))
+
+    items_per_order = 1 + rng.poisson(0.8, size=n)
+    item_order = np.repeat(np.arange(n), items_per_order)
+    products = dims["products"]
+    product_idx = rng.choice(len(products), size=len(item_order), p=dims["product_weights"])
+    quantity = np.minimum(1 + rng.poisson(0.6, size=len(item_order)), 5)
+    unit_price = products["price"].to_numpy()[product_idx]
+    order_total = np.round(np.bincount(item_order, weights=quantity * unit_price, minlength=n), 2)
+
+    orders = pd.DataFrame({
+        "order_id": order_ids,
+        "customer_id": customer_ids,
+        "order_date": order_date,
+        "promised_delivery_time": promised,
+        "actual_delivery_time": promised + pd.to_timedelta(delay, unit="m"),
+        "delivery_status": status,
+        "order_total": order_total,
+        "payment_method": rng.choice(PAYMENT_METHODS, size=n, p=PAYMENT_WEIGHTS),
+        "delivery_partner_id": rng.integers(1, dims["sizes"]["partners"] + 1, size=n),
+        "store_id": rng.integers(1, dims["sizes"]["stores"] + 1, size=n),
+    })
+    order_items = pd.DataFrame({
+        "order_id": order_ids[item_order],
+        "product_id": product_idx + 1,
+        "quantity": quantity,
+        "unit_price": unit_price,
+    })
+
+    # Ratings fall with lateness; sentiment and wording follow the rating
+    has_feedback = rng.random(size=n) < feedback_rate
+    rating = np.clip(np.round(4.4 - 0.12 * np.maximum(delay, 0) + rng.normal(0, 0.8, size=n)), 1, 5)
+    sentiment = np.where(rating >= 4, "Positive", np.where(rating == 3, "Neutral", "Negative"))
+    category = rng.choice(FEEDBACK_CATEGORIES, size=n)
+    category = np.where((delay > 10) & (rng.random(size=n) < 0.6), "Delivery", category)
+    variant = rng.integers(0, 2, size=n)
+    text = [FEEDBACK_TEXT[c][s][v] for c, s, v in zip(category, sentiment, variant)]
+    feedback = pd.DataFrame({
+        "feedback_id": order_ids,
+        "order_id": order_ids,
+        "customer_id": customer_ids,
+        "rating": rating.astype(int),
+        "feedback_text": text,
+        "feedback_category": category,
+        "sentiment": sentiment,
+        "feedback_date": order_date.normalize(),
+    })[has_feedback]
+
+    return {"blinkit_orders": orders, "blinkit_order_items": order_items,
+            "blinkit_customer_feedback": feedback}
+
+
+def blinkit_data_chunk(dims, facts):
+    # The dashboard's wide table: the six-way join plus the derived order
+    # columns (day, hour, delay) the dashboard and the delay model read
+    orders = facts["blinkit_orders"]
+    c = dims["customers"]
+    cust = orders["customer_id"].to_numpy() - 1
+    wide = orders.assign(
+        customer_name=[f"Customer {i:07d}" for i in cust + 1],
+        area=dims["areas"][c["area"][cust]],
+        pincode=c["pincode"][cust],
+        customer_segment=np.array(SEGMENTS, dtype=object)[c["segment"][cust]],
+        total_orders=c["total_orders"][cust],
+        avg_order_value=c["avg_order_value"][cust],
+    )
+    wide = (wide.merge(facts["blinkit_order_items"], on="order_id", how="left")
+                .merge(dims["products"].drop(columns=["min_stock_level", "max_stock_level"]),
+                       on="product_id", how="left")
+                .merge(facts["blinkit_customer_feedback"][
+                           ["order_id", "rating", "feedback_category", "sentiment", "feedback_text"]],
+                       on="order_id", how="left"))
+    wide["item_total"] = wide["quantity"] * wide["unit_price"]
+    wide["order_day_only"] = wide["order_date"].dt.normalize()
+    marketing = dims["marketing"][["date", "campaign_name", "channel", "target_audience",
+                                   "spend", "revenue_generated", "roas"]]
+    wide = wide.merge(marketing, left_on="order_day_only", right_on="date", how="left").drop(columns="date")
+
+    wide["promised_date"] = wide["promised_delivery_time"].dt.normalize()
+    wide["order_hour"] = wide["order_date"].dt.hour
+    wide["order_minutes"] = wide["order_date"].dt.minute
+    wide["order_day_name"] = wide["order_date"].dt.day_name()
+    wide["order_month_name"] = wide["order_date"].dt.month_name()
+    wide["delay_minutes"] = (
+        (wide["actual_delivery_time"] - wide["promised_delivery_time"]).dt.total_seconds() / 60
+    ).round()
+    return wide.drop(columns=["promised_delivery_time", "actual_delivery_time", "store_id"])
+
+
+# -------------------------------------------------
+# TARGETS
+# -------------------------------------------------
+def open_target(target):
+    # "*.db" / "*.sqlite" -> SQLite file, "*.duckdb" -> DuckDB file, anything
+    # else -> directory of CSV exports named like the real ones
+    if target.endswith((".db", ".sqlite", ".duckdb")):
+        if os.path.exists(target):
+            os.remove(target)
+        dialect = "duckdb" if target.endswith(".duckdb") else "sqlite"
+        return "sql", Backend({"backend": dialect, "path": target})
+    os.makedirs(target, exist_ok=True)
+    return "csv", target
+
+
+def write_rows(kind, con, table, frame, first):
+    if kind == "csv":
+        path = os.path.join(con, SOURCE_TABLES.get(table, f"{table}.csv"))
+        frame.to_csv(path, mode="w" if first else "a", header=first, index=False)
+    else:
+        con.write_table(table, frame, if_exists="replace" if first else "append")
+
+
+# Join keys of the six-way join and the dashboard's date filter
+INDEXES = {
+    "blinkit_orders": ["customer_id", "order_id"],
+    "blinkit_customers": ["customer_id"],
+    "blinkit_order_items": ["order_id"],
+    "blinkit_products": ["product_id"],
+    "blinkit_customer_feedback": ["order_id"],
+    "blinkit_marketing_performance": ["date"],
+    "blinkit_data": ["order_day_only"],
+}
+
+
+def finish_target(kind, con):
+    if kind == "csv":
+        return
+    for table, columns in INDEXES.items():
+        for col in columns:
+            con.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({col})")
+
+
+# -------------------------------------------------
+# GENERATE
+# -------------------------------------------------
+def generate(target, orders=10_000, days=365, campaigns_per_day=2, feedback_rate=1.0,
+             chunk_orders=200_000, seed=42, parquet_path=None):
+    rng = np.random.default_rng(seed)
+    stats = {"orders": orders, "rows": {}, "generate_seconds": 0.0, "write_seconds": 0.0}
+
+    def timed_write(table, frame, first):
+        start = time.perf_counter()
+        write_rows(kind, con, table, frame, first)
+        stats["write_seconds"] += time.perf_counter() - start
+        stats["rows"][table] = stats["rows"].get(table, 0) + len(frame)
+
+    start = time.perf_counter()
+    dims = build_dimensions(rng, orders, days, campaigns_per_day)
+    stats["generate_seconds"] += time.perf_counter() - start
+    stats["cardinalities"] = dims["sizes"]
+
+    kind, con = open_target(target)
+    if parquet_path and os.path.exists(parquet_path):
+        shutil.rmtree(parquet_path)
+
+    timed_write("blinkit_products", dims["products"], True)
+    timed_write("blinkit_marketing_performance", dims["marketing"], True)
+    n_customers = dims["customers"]["count"]
+    for chunk_id, lo in enumerate(range(0, n_customers, chunk_orders)):
+        start = time.perf_counter()
+        frame = customers_table(dims, lo, min(lo + chunk_orders, n_customers))
+        stats["generate_seconds"] += time.perf_counter() - start
+        timed_write("blinkit_customers", frame, chunk_id == 0)
+
+    for chunk_id, lo in enumerate(range(0, orders, chunk_orders)):
+        start = time.perf_counter()
+        facts = fact_chunk(rng, dims, lo, min(lo + chunk_orders, orders), orders, feedback_rate)
+        wide = blinkit_data_chunk(dims, facts)
+        stats["generate_seconds"] += time.perf_counter() - start
+
+        if parquet_path:
+            start = time.perf_counter()
+            write_parquet(wide, parquet_path, chunk_id=chunk_id)
+            stats["write_seconds"] += time.perf_counter() - start
+        for table, frame in facts.items():
+            timed_write(table, frame, chunk_id == 0)
+        timed_write("blinkit_data", wide, chunk_id == 0)
+
+    start = time.perf_counter()
+    finish_target(kind, con)
+    if kind != "csv":
+        con.close()
+    stats["write_seconds"] += time.perf_counter() - start
+
+    stats["generate_seconds"] = round(stats["generate_seconds"], 2)
+    stats["write_seconds"] = round(stats["write_seconds"], 2)
+    return stats
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Blinkit tables at a chosen scale")
+    parser.add_argument("target", help="blinkit.db / blinkit.sqlite (SQLite), blinkit.duckdb, or a directory for CSVs")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--campaigns-per-day", type=int, default=2)
+    parser.add_argument("--feedback-rate", type=float, default=1.0)
+    parser.add_argument("--chunk-orders", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--parquet", default=None, help="Also write blinkit_data as partitioned Parquet here")
+    args = parser.parse_args()
+
+    stats = generate(args.target, args.orders, args.days, args.campaigns_per_day,
+                     args.feedback_rate, args.chunk_orders, args.seed, args.parquet)
+    for table, rows in stats["rows"].items():
+        print(f"{table}: {rows:,} rows")
+    print(f"Generated in {stats['generate_seconds']}s, written in {stats['write_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import pickle
+import time
+import tracemalloc
+
+from sklearn.base import clone
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import RandomizedSearchCV, TimeSeriesSplit
+
+from blinkit_store import default_dataset
+from delay_model import (
+    FEATURE_COLUMNS, TARGET, build_pipeline, build_reference,
+    read_feature_frame, save_profile
+)
+from risk_table import TABLE_PATH, load_risk_table
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# -------------------------------------------------
+# SEARCH SPACE
+# -------------------------------------------------
+PARAM_DISTRIBUTIONS = {
+    "model__n_estimators": [100, 200, 300, 500],
+    "model__max_depth": [None, 10, 20, 30],
+    "model__min_samples_leaf": [1, 2, 5, 10],
+    "model__max_features": ["sqrt", 0.3, 0.5, 1.0],
+}
+
+
+def max_rss_mb():
+    # Peak resident memory of this process (joblib workers are separate
+    # processes and are not included)
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def traced_peak_mb(fn):
+    # Python allocation peak of one call. Tracing slows every allocation, so
+    # this runs as its own pass, never around anything that is being timed.
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def train(data_path, chunksize=200_000, n_iter=20, cv_splits=5, n_jobs=-1, random_state=42):
+    report = {}
+
+    start = time.perf_counter()
+    frame = read_feature_frame(data_path, chunksize=chunksize)
+    report["load_seconds"] = round(time.perf_counter() - start, 2)
+    report["rows"] = len(frame)
+    report["frame_mb"] = round(frame.memory_usage(deep=True).sum() / 1024 ** 2, 1)
+
+    X, y = frame[FEATURE_COLUMNS], frame[TARGET]
+
+    # Candidates x folds run in parallel; each forest stays single-threaded
+    # so the two levels of parallelism don't oversubscribe the cores
+    search = RandomizedSearchCV(
+        build_pipeline(n_jobs=1, random_state=random_state),
+        PARAM_DISTRIBUTIONS,
+        n_iter=n_iter,
+        cv=TimeSeriesSplit(n_splits=cv_splits),
+        scoring="neg_mean_absolute_error",
+        n_jobs=n_jobs,
+        random_state=random_state,
+    )
+
+    start = time.perf_counter()
+    search.fit(X, y)
+    report["search_seconds"] = round(time.perf_counter() - start, 2)
+
+    best_pipeline = search.best_estimator_
+    best_pipeline.set_params(model__n_jobs=n_jobs)
+
+    report["cv_mae"] = round(-search.best_score_, 3)
+    report["train_mae"] = round(mean_absolute_error(y, best_pipeline.predict(X)), 3)
+    report["best_params"] = dict(search.best_params_)
+
+    # Memory pass, after the timings: one single-threaded fit of the winning
+    # pipeline, which is what each search worker holds at a time
+    single_fit = clone(best_pipeline).set_params(model__n_jobs=1)
+    report["fit_python_peak_mb"] = traced_peak_mb(lambda: single_fit.fit(X, y))
+    report["max_rss_mb"] = max_rss_mb()
+
+    profile = build_reference(frame)
+    profile["training"] = report
+    return best_pipeline, profile
+
+
+# -------------------------------------------------
+# CLI
+# -------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Train the Blinkit delivery-delay model")
+    parser.add_argument("--data", default=default_dataset())
+    parser.add_argument("--model-out", default="blinkit_best__model.pkl")
+    parser.add_argument("--profile-out", default="blinkit_model_defaults.json")
+    parser.add_argument("--table-out", default=TABLE_PATH, help="Risk calculator lookup table")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--cv-splits", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--random-state", type=int, default=42)
+    args = parser.parse_args()
+
+    pipeline, profile = train(
+        args.data,
+        chunksize=args.chunksize,
+        n_iter=args.n_iter,
+        cv_splits=args.cv_splits,
+        n_jobs=args.n_jobs,
+        random_state=args.random_state,
+    )
+
+    with open(args.model_out, "wb") as f:
+        pickle.dump(pipeline, f)
+    save_profile(profile, args.profile_out)
+    # Precomputed here so the risk calculator's first request doesn't build it
+    load_risk_table(args.model_out, profile, args.table_out)
+
+    for key, value in profile["training"].items():
+        print(f"{key}: {value}")
+    print(f"Saved {args.model_out}, {args.profile_out} and {args.table_out}")
+
+
+if __name__ == "__main__":
+    main()